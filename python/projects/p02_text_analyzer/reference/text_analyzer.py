@@ -8,55 +8,384 @@ Usage:
     python text_analyzer.py              # run demo
     python text_analyzer.py --test       # run built-in tests
     python text_analyzer.py FILE         # analyze a text file
+    python text_analyzer.py --stream FILE  # stats + readability, bounded memory
+    python text_analyzer.py --stream --mmap FILE  # same, bytes fast path
+    python text_analyzer.py --jobs N PATH...  # corpus of files/dirs, N processes
+    (add --approx to --stream/--jobs for fixed-memory top/unique words,
+     --pipeline to --jobs to stream files through IngestionPipeline)
+    python text_analyzer.py --bench [--sizes MB,MB] [--layouts L,L] [--json OUT]
 """
 
+import asyncio
+import inspect
+import json
+import os
+import platform
+import random
 import re
+import sys
+import threading
 import time
+import tracemalloc
 import hashlib
-from dataclasses import dataclass, field
-from collections import Counter
-from functools import wraps
-from itertools import islice
+import heapq
+import math
+import mmap
+import operator
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from collections import Counter, OrderedDict, defaultdict
+from functools import lru_cache, partial, wraps
+from itertools import accumulate, chain, islice, repeat
+
+
+# ---------------------------------------------------------------------------
+# Result cache
+# ---------------------------------------------------------------------------
+
+def _deep_sizeof(obj, _seen=None) -> int:
+    """Approximate the memory held by *obj* and the objects it contains."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        size += sum(
+            _deep_sizeof(k, _seen) + _deep_sizeof(v, _seen) for k, v in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, _seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _deep_sizeof(vars(obj), _seen)
+    return size
+
+
+@dataclass
+class CacheStats:
+    """Snapshot of a ``ResultCache``'s counters."""
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResultCache:
+    """Thread-safe LRU whose capacity is a memory budget in bytes.
+
+    Every value's size is estimated when it is stored; least recently used
+    entries are evicted until the total fits ``max_bytes``.  Entries can be
+    tied to an *owner* object and are then removed when it is collected.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()  # key -> (value, size, owner id)
+        self._by_owner: dict[int, set] = {}
+        # Re-entrant: a garbage collection triggered while the lock is held
+        # may run an owner's finalizer, which evicts under the same lock.
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return ``(found, value)``.  Raises TypeError for unhashable keys."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key, value, owner=None) -> None:
+        size = _deep_sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            owner_id = id(owner) if owner is not None else None
+            self._entries[key] = (value, size, owner_id)
+            self._bytes += size
+            if owner is not None:
+                if owner_id not in self._by_owner:
+                    self._by_owner[owner_id] = set()
+                    weakref.finalize(owner, self._evict_owner, owner_id)
+                self._by_owner[owner_id].add(key)
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key) -> None:
+        _value, size, owner_id = self._entries.pop(key)
+        self._bytes -= size
+        if owner_id is not None:
+            self._by_owner[owner_id].discard(key)
+
+    def discard_owner(self, owner) -> None:
+        """Drop every entry tied to *owner*, e.g. after its input changed."""
+        with self._lock:
+            for key in list(self._by_owner.get(id(owner), ())):
+                self._remove(key)
+
+    def _evict_owner(self, owner_id: int) -> None:
+        with self._lock:
+            for key in self._by_owner.pop(owner_id, ()):
+                _value, size, _owner = self._entries.pop(key)
+                self._bytes -= size
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_owner.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+RESULT_CACHE = ResultCache()
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+METRIC_PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """Log-bucketed nanosecond latencies; percentiles within ``relative_accuracy``."""
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._inv_log_gamma = 1 / math.log(self._gamma)
+        self._buckets: dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, elapsed_ns: int) -> None:
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        if elapsed_ns <= 0:
+            self._zero_count += 1
+            return
+        index = math.ceil(math.log(elapsed_ns) * self._inv_log_gamma)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def percentile(self, pct: float) -> float:
+        """Return the approximate *pct*-th percentile (0-100) in nanoseconds."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = self._zero_count
+        if seen >= rank:
+            return 0.0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                break
+        return min(2 * self._gamma ** index / (self._gamma + 1), self.max_ns)
+
+
+@dataclass
+class MethodMetrics:
+    """Snapshot of one method's call count and latencies (in seconds)."""
+    name: str
+    calls: int
+    total: float
+    max: float
+    p50: float
+    p95: float
+    p99: float
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+class MetricsRegistry:
+    """Thread-safe per-method call counts and latency histograms.
+
+    ``timer`` records every call here (``perf_counter_ns``), so nothing is
+    overwritten between calls, instances or threads.  ``snapshot()`` and
+    ``as_dict()`` read consistent copies; ``format()`` renders the table
+    used by ``TextAnalyzer.report()``.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.relative_accuracy = relative_accuracy
+        self._lock = threading.Lock()
+        self._series: dict[str, LatencyHistogram] = {}
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        with self._lock:
+            histogram = self._series.get(name)
+            if histogram is None:
+                histogram = self._series[name] = LatencyHistogram(
+                    self.relative_accuracy
+                )
+            histogram.add(elapsed_ns)
+
+    def snapshot(self) -> dict[str, MethodMetrics]:
+        with self._lock:
+            return {
+                name: MethodMetrics(
+                    name=name,
+                    calls=h.count,
+                    total=h.total_ns / 1e9,
+                    max=h.max_ns / 1e9,
+                    p50=h.percentile(50) / 1e9,
+                    p95=h.percentile(95) / 1e9,
+                    p99=h.percentile(99) / 1e9,
+                )
+                for name, h in sorted(self._series.items())
+            }
+
+    def as_dict(self) -> dict[str, dict]:
+        """Return ``{method: {calls, total, max, p50, p95, p99}}`` for JSON."""
+        return {
+            name: {k: v for k, v in vars(m).items() if k != "name"}
+            for name, m in self.snapshot().items()
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def format(self) -> list[str]:
+        """Return one aligned line per method (header first)."""
+        lines = [f"  {'method':<28}{'calls':>8}{'p50':>12}{'p95':>12}{'p99':>12}"]
+        for name, m in self.snapshot().items():
+            lines.append(
+                f"  {name:<28}{m.calls:>8}{m.p50:>11.6f}s{m.p95:>11.6f}s"
+                f"{m.p99:>11.6f}s"
+            )
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+METRICS = MetricsRegistry()
 
 
 # ---------------------------------------------------------------------------
 # Decorators
 # ---------------------------------------------------------------------------
 
-def timer(func):
-    """Decorator that measures and stores execution time on the wrapper."""
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start = time.perf_counter()
-        result = func(*args, **kwargs)
-        elapsed = time.perf_counter() - start
-        wrapper.last_elapsed = elapsed
-        return result
-    wrapper.last_elapsed = 0.0
-    return wrapper
+def timer(func=None, *, registry: MetricsRegistry | None = None):
+    """Decorator that records each call's duration in a ``MetricsRegistry``.
+
+    Durations are measured with ``time.perf_counter_ns`` and filed under
+    the function's qualified name (e.g. ``TextAnalyzer.stats``) in
+    *registry*, ``METRICS`` by default.  Use as ``@timer`` or
+    ``@timer(registry=...)``.
+    """
+    def decorate(func):
+        store = registry if registry is not None else METRICS
+        name = func.__qualname__
+        clock = time.perf_counter_ns
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                store.record(name, clock() - start)
 
+        wrapper.metrics = store
+        return wrapper
 
-def cache_result(func):
-    """Decorator that caches the return value keyed on the instance's text hash.
+    return decorate if func is None else decorate(func)
+
+
+def cache_result(func=None, *, weak: bool = False, cache: "ResultCache | None" = None):
+    """Decorator that memoizes a method in a bounded, size-aware LRU.
 
     Works with methods whose first positional argument is `self` and whose
-    self has a `_text_hash` attribute.  If the hash matches a previous call,
-    the cached result is returned immediately.
+    self has a `_text_hash` attribute.  The key is the method, the text
+    hash and the call's arguments (defaults filled in), so ``stats()`` and
+    ``stats(top_n=10)`` share an entry while ``stats(top_n=3)`` does not.
+
+    By default entries are shared by every analyzer with the same text and
+    stopwords.  With ``weak=True`` they belong to the instance and are
+    dropped as soon as it is garbage-collected.  Calls with unhashable
+    arguments are not cached.  Use as ``@cache_result`` or
+    ``@cache_result(weak=True)``.
     """
-    @wraps(func)
-    def wrapper(self, *args, **kwargs):
-        key = (func.__name__, self._text_hash)
-        if key not in wrapper._cache:
-            wrapper._cache[key] = func(self, *args, **kwargs)
-        return wrapper._cache[key]
-    wrapper._cache = {}
-    return wrapper
+    def decorate(func):
+        signature = inspect.signature(func)
+        store = cache if cache is not None else RESULT_CACHE
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = tuple(bound.arguments.items())[1:]  # skip self
+            owner = id(self) if weak else None
+            key = (func.__qualname__, owner, self._text_hash, arguments)
+            try:
+                found, value = store.get(key)
+            except TypeError:  # unhashable argument
+                return func(self, *args, **kwargs)
+            if not found:
+                value = func(self, *args, **kwargs)
+                store.put(key, value, owner=self if weak else None)
+            return value
+
+        wrapper.cache = store
+        return wrapper
+
+    return decorate if func is None else decorate(func)
 
 
 # ---------------------------------------------------------------------------
 # Helper
 # ---------------------------------------------------------------------------
 
+_VOWEL_GROUP_RE = re.compile(r"[aeiouy]+")
+SYLLABLE_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
 def count_syllables(word: str) -> int:
     """Approximate the number of syllables in an English word.
 
@@ -64,18 +393,30 @@ def count_syllables(word: str) -> int:
       1. Count groups of consecutive vowels (a, e, i, o, u, y).
       2. Subtract 1 if the word ends with a silent 'e'.
       3. Ensure every word has at least 1 syllable.
+
+    Results are memoized in a bounded LRU shared by every analyzer in the
+    process (see ``count_syllables.cache_info()``).
     """
     word = word.lower().strip()
     if not word:
         return 0
     # Count vowel groups
-    count = len(re.findall(r"[aeiouy]+", word))
+    count = len(_VOWEL_GROUP_RE.findall(word))
     # Silent 'e' at the end
     if word.endswith("e") and not word.endswith("le"):
         count -= 1
     return max(count, 1)
 
 
+def count_syllables_batch(word_counts) -> int:
+    """Total syllables for a ``{word: occurrences}`` mapping (e.g. a Counter).
+
+    Each distinct word is looked up once, so the cost follows the
+    vocabulary size rather than the number of tokens.
+    """
+    return sum(count_syllables(w) * c for w, c in word_counts.items())
+
+
 # ---------------------------------------------------------------------------
 # Dataclasses for structured results
 # ---------------------------------------------------------------------------
@@ -89,14 +430,24 @@ class TextStats:
     avg_word_length: float
     unique_words: int
     top_words: list[tuple[str, int]] = field(default_factory=list)
+    # Set when computed from sketches (see scan_chunks(approximate=True)):
+    # top-word counts may be low by up to top_words_error, and
+    # unique_words has a relative standard error of unique_words_error.
+    approximate: bool = False
+    top_words_error: int = 0
+    unique_words_error: float = 0.0
 
     def __str__(self) -> str:
         top = ", ".join(f"{w} ({c})" for w, c in self.top_words)
+        unique = str(self.unique_words)
+        if self.approximate:
+            unique = f"~{self.unique_words} (+/-{self.unique_words_error:.1%})"
+            top += f"  [counts may be low by up to {self.top_words_error}]"
         return (
             f"Words: {self.word_count}  |  Sentences: {self.sentence_count}  "
             f"|  Characters: {self.char_count}\n"
             f"Avg word length: {self.avg_word_length:.2f}  "
-            f"|  Unique words: {self.unique_words}\n"
+            f"|  Unique words: {unique}\n"
             f"Top words: {top}"
         )
 
@@ -108,32 +459,2059 @@ class ReadabilityScore:
     avg_sentence_length: float
     avg_syllables_per_word: float
 
-    def __str__(self) -> str:
-        return (
-            f"Flesch-Kincaid grade level: {self.flesch_kincaid_grade:.1f}\n"
-            f"Avg sentence length: {self.avg_sentence_length:.1f} words\n"
-            f"Avg syllables/word: {self.avg_syllables_per_word:.2f}"
-        )
+    def __str__(self) -> str:
+        return (
+            f"Flesch-Kincaid grade level: {self.flesch_kincaid_grade:.1f}\n"
+            f"Avg sentence length: {self.avg_sentence_length:.1f} words\n"
+            f"Avg syllables/word: {self.avg_syllables_per_word:.2f}"
+        )
+
+
+# ---------------------------------------------------------------------------
+# Default stopwords
+# ---------------------------------------------------------------------------
+
+DEFAULT_STOPWORDS: set[str] = {
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
+    "of", "with", "by", "is", "am", "are", "was", "were", "be", "been",
+    "being", "have", "has", "had", "do", "does", "did", "will", "would",
+    "shall", "should", "may", "might", "must", "can", "could", "it", "its",
+    "i", "me", "my", "we", "us", "our", "you", "your", "he", "him", "his",
+    "she", "her", "they", "them", "their", "this", "that", "these", "those",
+    "not", "no", "nor", "so", "if", "then", "than", "too", "very", "just",
+    "about", "above", "after", "again", "all", "also", "as", "because",
+    "before", "between", "both", "each", "from", "into", "more", "most",
+    "other", "out", "over", "own", "same", "some", "such", "there", "through",
+    "under", "up", "what", "when", "where", "which", "while", "who", "whom",
+    "why", "how",
+}
+
+
+@lru_cache(maxsize=64)
+def _frozen_stopwords_digest(stopwords: frozenset[str]) -> bytes:
+    joined = "\x00".join(sorted(stopwords)).encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(joined, digest_size=16).digest()
+
+
+def _stopwords_digest(stopwords) -> bytes:
+    """Digest of a stopword set, computed once per distinct set of words.
+
+    Analyzers usually share one set (``DEFAULT_STOPWORDS``), so the digest
+    is cached separately from the per-text hash, keyed on a frozen copy:
+    a set mutated in place gets a fresh digest.
+    """
+    if not isinstance(stopwords, frozenset):
+        stopwords = frozenset(stopwords)
+    return _frozen_stopwords_digest(stopwords)
+
+
+# ---------------------------------------------------------------------------
+# Sketches (bounded-memory approximate counting)
+# ---------------------------------------------------------------------------
+
+HEAVY_HITTER_CAPACITY = 1024
+HLL_PRECISION = 14
+
+
+@dataclass
+class MisraGries:
+    """Misra-Gries heavy-hitter summary over weighted updates.
+
+    Keeps at most ``2 * capacity`` counters.  When that is exceeded every
+    counter is reduced by the ``(capacity + 1)``-th largest count and the
+    ones that reach zero are dropped.  Each reduction removes at least
+    ``capacity + 1`` times its amount from the total, so any word's count
+    is underestimated by at most ``error <= total / (capacity + 1)``.
+    Summaries merge by adding counters and reducing again.
+    """
+    capacity: int = HEAVY_HITTER_CAPACITY
+    counts: dict[str, int] = field(default_factory=dict)
+    total: int = 0
+    error: int = 0
+
+    def update(self, word_counts) -> None:
+        counts = self.counts
+        for word, c in word_counts.items():
+            counts[word] = counts.get(word, 0) + c
+            self.total += c
+        if len(counts) > 2 * self.capacity:
+            self._reduce()
+
+    def _reduce(self) -> None:
+        if len(self.counts) <= self.capacity:
+            return
+        cut = heapq.nlargest(self.capacity + 1, self.counts.values())[-1]
+        self.error += cut
+        self.counts = {w: c - cut for w, c in self.counts.items() if c > cut}
+
+    def merge(self, other: "MisraGries") -> "MisraGries":
+        merged = MisraGries(
+            capacity=min(self.capacity, other.capacity),
+            counts=dict(self.counts),
+            total=self.total + other.total,
+            error=self.error + other.error,
+        )
+        for word, c in other.counts.items():
+            merged.counts[word] = merged.counts.get(word, 0) + c
+        merged._reduce()
+        return merged
+
+    def most_common(self, n: int | None = None) -> list[tuple[str, int]]:
+        return Counter(self.counts).most_common(n)
+
+
+def _hash64(word: str) -> int:
+    """Stable 64-bit hash (unlike hash(), identical in every process)."""
+    digest = hashlib.blake2b(word.encode("utf-8", "surrogatepass"), digest_size=8)
+    return int.from_bytes(digest.digest(), "big")
+
+
+@dataclass
+class HyperLogLog:
+    """HyperLogLog distinct counter with ``2 ** precision`` one-byte registers.
+
+    Memory is fixed (16 KiB at the default precision) and the relative
+    standard error is ``1.04 / sqrt(2 ** precision)`` -- about 0.8%.
+    Sketches merge by taking the register-wise maximum.
+    """
+    precision: int = HLL_PRECISION
+    registers: bytearray | None = None
+
+    def __post_init__(self) -> None:
+        if not 4 <= self.precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        if self.registers is None:
+            self.registers = bytearray(1 << self.precision)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, word: str) -> None:
+        h = _hash64(word)
+        p = self.precision
+        index = h >> (64 - p)
+        rest = h & ((1 << (64 - p)) - 1)
+        rank = (64 - p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, words) -> None:
+        for word in words:
+            self.add(word)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if self.precision != other.precision:
+            raise ValueError("cannot merge HyperLogLogs of different precision")
+        return HyperLogLog(
+            self.precision, bytearray(map(max, self.registers, other.registers))
+        )
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))  # linear counting
+        return round(raw)
+
+
+# ---------------------------------------------------------------------------
+# Fused scan engine
+# ---------------------------------------------------------------------------
+
+_WORD_RE = re.compile(r"[a-zA-Z']+")
+# A sentence boundary is whitespace after . ! or ? that is followed by more
+# text -- exactly the splits _sentences() makes on the stripped text.
+_SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?])\s+(?=\S)")
+_CUT_RE = re.compile(r"\S(?=\s)")
+_NON_SPACE_RE = re.compile(r"\S")
+_NON_WORD_RE = re.compile(r"[^a-zA-Z']")
+
+SCAN_BLOCK_SIZE = 1 << 20  # characters handed to the scanner at a time
+MAX_CARRY = 16 * SCAN_BLOCK_SIZE  # force a cut inside very long unbroken runs
+
+# Bytes fast path (see scan_bytes).  These are the str patterns restricted
+# to ASCII: \s and str.split() both treat \t-\r, \x1c-\x1f and space as
+# whitespace.
+_ASCII_SPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+_BYTES_SENTENCE_BREAK_RE = re.compile(
+    rb"(?<=[.!?])[\t-\r\x1c-\x1f ]+(?=[^\t-\r\x1c-\x1f ])"
+)
+# A cut point: after an ASCII non-space byte that is followed by ASCII
+# whitespace, or (fallback) after an ASCII non-space byte that cannot be
+# in a word.  Either way the byte before the cut is ASCII and not
+# whitespace, so UTF-8 sequences, words and whitespace runs are never split.
+_BYTES_CUT_RE = re.compile(rb"[\x00-\x08\x0e-\x1b!-\x7f](?=[\t-\r\x1c-\x1f ])")
+_BYTES_NON_WORD_RE = re.compile(rb"[\x00-\x08\x0e-\x1b!-&(-@\[-`{-\x7f]")
+# Lowercases ASCII letters and blanks every byte that cannot be in a word,
+# so bytes.split() yields exactly _WORD_RE's lowercased tokens.
+_BYTES_WORD_TABLE = bytes(
+    b if (97 <= b <= 122 or b == 39) else b + 32 if 65 <= b <= 90 else 32
+    for b in range(256)
+)
+
+
+@dataclass
+class TextCounts:
+    """Raw aggregates collected in a single pass over a text.
+
+    Every public metric (``TextStats``, ``ReadabilityScore``) is derived
+    from these numbers, so a document is scanned once no matter how many
+    reports are produced from it.
+    """
+    word_count: int = 0
+    sentence_count: int = 0
+    char_count: int = 0
+    letter_count: int = 0
+    syllable_count: int = 0
+    freq: Counter = field(default_factory=Counter)
+    # Approximate mode keeps sketches instead of the full ``freq`` table.
+    heavy_hitters: MisraGries | None = None
+    distinct: HyperLogLog | None = None
+
+    @property
+    def approximate(self) -> bool:
+        return self.distinct is not None
+
+    def merge(self, other: "TextCounts") -> "TextCounts":
+        """Return the counts of two texts analyzed as one corpus.
+
+        Sentences are not joined across documents, so sentence counts add.
+        Exact and approximate counts cannot be mixed.
+        """
+        merged = replace(self, freq=Counter(self.freq))
+        merged.update(other)
+        return merged
+
+    def update(self, other: "TextCounts") -> None:
+        """Add *other* to these counts in place (see ``merge``)."""
+        if self.approximate != other.approximate:
+            raise ValueError("cannot merge exact and approximate TextCounts")
+        self.word_count += other.word_count
+        self.sentence_count += other.sentence_count
+        self.char_count += other.char_count
+        self.letter_count += other.letter_count
+        self.syllable_count += other.syllable_count
+        self.freq.update(other.freq)
+        if self.approximate:
+            self.heavy_hitters = self.heavy_hitters.merge(other.heavy_hitters)
+            self.distinct = self.distinct.merge(other.distinct)
+
+    def to_stats(self, stopwords: set[str], top_n: int = 10) -> TextStats:
+        """Build a ``TextStats`` (frequencies exclude *stopwords*).
+
+        For approximate counts the heavy-hitter summary already excludes
+        the stopwords it was scanned with.
+        """
+        avg_word_length = (
+            self.letter_count / self.word_count if self.word_count else 0.0
+        )
+        stats = TextStats(
+            word_count=self.word_count,
+            sentence_count=self.sentence_count,
+            char_count=self.char_count,
+            avg_word_length=round(avg_word_length, 2),
+            unique_words=len(self.freq),
+        )
+        if self.approximate:
+            stats.approximate = True
+            stats.unique_words = self.distinct.estimate()
+            stats.unique_words_error = round(self.distinct.relative_error, 4)
+            stats.top_words_error = self.heavy_hitters.error
+            stats.top_words = [
+                (w, c) for w, c in self.heavy_hitters.most_common()
+                if w not in stopwords
+            ][:top_n]
+        else:
+            filtered = Counter(
+                {w: c for w, c in self.freq.items() if w not in stopwords}
+            )
+            stats.top_words = filtered.most_common(top_n)
+        return stats
+
+    def to_readability(self) -> ReadabilityScore:
+        """Build a Flesch-Kincaid ``ReadabilityScore``.
+
+        Formula:
+            grade = 0.39 * (words / sentences)
+                  + 11.8 * (syllables / words)
+                  - 15.59
+        """
+        return ReadabilityScore(*_flesch_kincaid(
+            self.word_count, self.sentence_count, self.syllable_count
+        ))
+
+
+def _flesch_kincaid(words: int, sentences: int, syllables: int):
+    """Return rounded (grade, avg_sentence_length, avg_syllables_per_word)."""
+    avg_sentence_length = words / (sentences or 1)  # avoid division by zero
+    avg_syllables = syllables / words if words else 0.0
+    grade = (
+        0.39 * avg_sentence_length
+        + 11.8 * avg_syllables
+        - 15.59
+    )
+    return (
+        round(grade, 1),
+        round(avg_sentence_length, 1),
+        round(avg_syllables, 2),
+    )
+
+
+class _TextScanner:
+    """Accumulate ``TextCounts`` from text fed in arbitrary pieces.
+
+    Each ``feed()`` processes everything up to the last non-space/space
+    boundary and carries the rest, so neither a word nor a sentence break
+    is ever split between two pieces.  The carry keeps one character of
+    look-behind so a ``.`` at the end of one piece still ends a sentence
+    whose whitespace arrives in the next.
+
+    With *approximate* set, words go into fixed-size sketches (Misra-Gries
+    for top words, excluding *stopwords*; HyperLogLog for distinct words)
+    instead of a frequency table, so memory no longer grows with the
+    vocabulary.
+
+    ``snapshot()`` reports the counts so far without ending the input
+    (exact mode only); from then on word, letter and syllable totals are
+    kept current as pieces arrive.
+    """
+
+    def __init__(
+        self,
+        max_carry: int = MAX_CARRY,
+        approximate: bool = False,
+        stopwords=DEFAULT_STOPWORDS,
+        capacity: int = HEAVY_HITTER_CAPACITY,
+        precision: int = HLL_PRECISION,
+    ) -> None:
+        self._max_carry = max_carry
+        self._running = False  # word/letter/syllable totals kept current
+        self._provisional: tuple[Counter, int, int] | None = None
+        self._freq: Counter = Counter()
+        self._heavy_hitters = MisraGries(capacity) if approximate else None
+        self._distinct = HyperLogLog(precision) if approximate else None
+        self._stopwords = stopwords
+        self._word_count = 0
+        self._letter_count = 0
+        self._syllable_count = 0
+        self._char_count = 0
+        self._breaks = 0
+        self._carry = ""
+        self._carry_pos = 0  # index in _carry where unscanned text starts
+
+    def feed(self, piece: str) -> None:
+        self._undo_provisional()
+        buf = self._carry + piece
+        cut = self._last_cut(buf, self._carry_pos)
+        if cut < 0 and len(buf) > self._max_carry:
+            # No whitespace at all (minified data, base64 ...): cutting
+            # after any non-word character still keeps every word whole,
+            # and with no whitespace there is no sentence break to split.
+            cut = self._last_match_end(_NON_WORD_RE, buf, self._carry_pos)
+        if cut < 0:
+            self._carry = buf
+            return
+        self._scan(buf, self._carry_pos, cut)
+        self._carry = buf[cut - 1:]
+        self._carry_pos = 1
+
+    def finish(self) -> TextCounts:
+        """Scan the remaining carry and return the totals."""
+        self._undo_provisional()
+        self._scan(self._carry, self._carry_pos, len(self._carry))
+        self._carry = self._carry[-1:]
+        self._carry_pos = len(self._carry)
+
+        if self._distinct is not None:
+            return TextCounts(
+                word_count=self._word_count,
+                sentence_count=self._breaks + (1 if self._char_count else 0),
+                char_count=self._char_count,
+                letter_count=self._letter_count,
+                syllable_count=self._syllable_count,
+                heavy_hitters=self._heavy_hitters,
+                distinct=self._distinct,
+            )
+        freq = self._freq
+        return TextCounts(
+            word_count=freq.total(),
+            sentence_count=self._breaks + (1 if self._char_count else 0),
+            char_count=self._char_count,
+            letter_count=sum(len(w) * c for w, c in freq.items()),
+            syllable_count=count_syllables_batch(freq),
+            freq=freq,
+        )
+
+    def snapshot(self) -> TextCounts:
+        """Return the totals as if the input ended here, without ending it.
+
+        The first call derives the word, letter and syllable totals from the
+        frequency table; after that they are updated per piece.  The carry
+        is counted provisionally and taken back out by the next ``feed()``,
+        so later calls cost time proportional to the carry, not to the
+        input so far.  The returned ``freq`` is the scanner's live table
+        and changes with later pieces.
+        """
+        if self._distinct is not None:
+            raise ValueError("snapshot() needs an exact scanner")
+        self._undo_provisional()
+        if not self._running:
+            self._running = True
+            self._tally(self._freq, 1)
+        carry, pos = self._carry, self._carry_pos
+        tail = Counter(self._words(carry[pos:]))
+        chars = sum(map(len, carry[pos:].split()))
+        breaks = len(_SENTENCE_BREAK_RE.findall(carry, pos))
+        self._freq.update(tail)
+        self._tally(tail, 1)
+        self._char_count += chars
+        self._breaks += breaks
+        self._provisional = (tail, chars, breaks)
+        return TextCounts(
+            word_count=self._word_count,
+            sentence_count=self._breaks + (1 if self._char_count else 0),
+            char_count=self._char_count,
+            letter_count=self._letter_count,
+            syllable_count=self._syllable_count,
+            freq=self._freq,
+        )
+
+    def _undo_provisional(self) -> None:
+        if self._provisional is None:
+            return
+        tail, chars, breaks = self._provisional
+        self._provisional = None
+        freq = self._freq
+        freq.subtract(tail)
+        for word in tail:
+            if freq[word] <= 0:
+                del freq[word]
+        self._tally(tail, -1)
+        self._char_count -= chars
+        self._breaks -= breaks
+
+    def _tally(self, words: Counter, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) *words* from the running totals."""
+        self._word_count += sign * words.total()
+        self._letter_count += sign * sum(len(w) * c for w, c in words.items())
+        self._syllable_count += sign * count_syllables_batch(words)
+
+    @staticmethod
+    def _words(segment: str):
+        if segment.isascii():
+            return _WORD_RE.findall(segment.lower())
+        # str.lower() can turn some non-ASCII letters into ASCII ones,
+        # so lowercase the matched tokens, not the text.
+        return map(str.lower, _WORD_RE.findall(segment))
+
+    @staticmethod
+    def _last_cut(buf: str, lo: int) -> int:
+        """Return the index just past the last non-space char followed by
+        whitespace in ``buf[lo:]``, or -1.
+        """
+        return _TextScanner._last_match_end(_CUT_RE, buf, lo)
+
+    @staticmethod
+    def _last_match_end(pattern: re.Pattern, buf: str, lo: int) -> int:
+        """Return the end of the last *pattern* match in ``buf[lo:]``, or -1.
+
+        Searches a growing tail window, so the common case only looks at
+        the last few hundred characters.
+        """
+        window = 256
+        while True:
+            start = max(lo, len(buf) - window)
+            last = None
+            for last in pattern.finditer(buf, start):
+                pass
+            if last is not None:
+                return last.end()
+            if start == lo:
+                return -1
+            window *= 16
+
+    def _scan(self, buf: str, start: int, end: int) -> None:
+        if start >= end:
+            return
+        segment = buf[start:end]
+        self._char_count += sum(map(len, segment.split()))
+        self._breaks += len(_SENTENCE_BREAK_RE.findall(buf, start, end))
+        self._count_words(self._words(segment))
+
+    def scan_bytes(self, data, start: int, end: int, encoding: str = "utf-8") -> None:
+        """Scan ``data[start:end]`` of a bytes-like buffer.
+
+        ASCII segments are counted on the bytes themselves (one translate
+        and split instead of a regex and a lower() per token); others are
+        decoded and go through the str path.  *start* and *end* must be
+        cut points (see ``_next_bytes_cut``); no carry is kept, since
+        look-behind reads ``data`` directly.
+        """
+        if start >= end:
+            return
+        segment = bytes(data[start:end])  # no extra copy for bytes or mmap
+        if not segment.isascii():
+            # The byte before a cut point is always ASCII.
+            prefix = data[start - 1:start].decode("ascii")
+            text = prefix + segment.decode(encoding)
+            self._scan(text, len(prefix), len(text))
+            return
+        self._char_count += len(segment.translate(None, _ASCII_SPACE))
+        self._breaks += len(_BYTES_SENTENCE_BREAK_RE.findall(data, start, end))
+        local = Counter(segment.translate(_BYTES_WORD_TABLE).split())
+        # Decode the distinct words with one call rather than one per word.
+        words = b" ".join(local).decode("ascii").split(" ") if local else ()
+        self._count_words(Counter(dict(zip(words, local.values()))))
+
+    def _count_words(self, words) -> None:
+        if self._distinct is None and not self._running:
+            self._freq.update(words)
+            return
+        # Running/approximate mode: fold this segment's counts into the
+        # totals (and sketches) as they arrive.
+        local = words if isinstance(words, Counter) else Counter(words)
+        self._tally(local, 1)
+        if self._distinct is None:
+            self._freq.update(local)
+            return
+        self._distinct.update(local)
+        stopwords = self._stopwords
+        self._heavy_hitters.update(
+            {w: c for w, c in local.items() if w not in stopwords}
+        )
+
+
+def iter_sentence_spans(chunks):
+    """Yield ``(start, end)`` offsets of the sentences in a chunked text.
+
+    Offsets index the concatenation of *chunks* and delimit exactly the
+    sentences ``TextAnalyzer._sentences()`` yields (split after ``.``,
+    ``!`` or ``?`` followed by whitespace, stripped).  A sentence or a
+    whitespace run may span any number of chunks: only the last
+    non-space character before a trailing whitespace run is carried, so
+    memory stays bounded by the chunk size however long the input is.
+    """
+    offset = 0
+    sentence_start = None  # offset of the current sentence's first character
+    last_end = 0  # offset just past the last non-space character so far
+    # Carried to the next chunk: the last non-space character, plus one
+    # space if whitespace followed it (a break's look-behind needs only that).
+    tail = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buf = tail + chunk
+        base = offset - len(tail)  # offset of buf[0] for indexes >= len(tail)
+        if sentence_start is None:
+            m = _NON_SPACE_RE.search(chunk)
+            if m is not None:
+                sentence_start = offset + m.start()
+        # Start past tail[0]: breaks before it were found in earlier chunks.
+        for m in _SENTENCE_BREAK_RE.finditer(buf, 1 if tail else 0):
+            end = base + m.start() if m.start() >= len(tail) else last_end
+            yield sentence_start, end
+            sentence_start = base + m.end()
+        stripped = len(chunk.rstrip())
+        if stripped:
+            last_end = offset + stripped
+            tail = chunk[stripped - 1] + (" " if stripped < len(chunk) else "")
+        elif tail:
+            tail = tail[0] + " "
+        offset += len(chunk)
+    if sentence_start is not None:
+        yield sentence_start, last_end
+
+
+def scan_text(
+    text: str,
+    block_size: int = SCAN_BLOCK_SIZE,
+    **options,
+) -> TextCounts:
+    """Compute ``TextCounts`` for *text* in one pass, block by block.
+
+    *options* are passed on to ``scan_chunks``.
+    """
+    return scan_chunks(
+        (text[i:i + block_size] for i in range(0, len(text), block_size)),
+        **options,
+    )
+
+
+def scan_chunks(
+    chunks,
+    approximate: bool = False,
+    stopwords=None,
+    capacity: int = HEAVY_HITTER_CAPACITY,
+    precision: int = HLL_PRECISION,
+) -> TextCounts:
+    """Compute ``TextCounts`` from an iterable of text chunks.
+
+    Chunks may split words and sentences anywhere; partial tokens and
+    sentences are carried over to the next chunk.  Memory holds one chunk
+    plus the word-frequency table, never the whole text.
+
+    With ``approximate=True`` the frequency table is replaced by a
+    Misra-Gries summary of *capacity* counters (top words, excluding
+    *stopwords*) and a HyperLogLog of ``2 ** precision`` registers
+    (unique words), so memory is fixed and the resulting ``TextStats``
+    report their error bounds.  Word, sentence, character and syllable
+    totals stay exact.
+    """
+    scanner = _new_scanner(approximate, stopwords, capacity, precision)
+    for chunk in chunks:
+        scanner.feed(chunk)
+    return scanner.finish()
+
+
+def _new_scanner(
+    approximate: bool = False,
+    stopwords=None,
+    capacity: int = HEAVY_HITTER_CAPACITY,
+    precision: int = HLL_PRECISION,
+) -> _TextScanner:
+    return _TextScanner(
+        approximate=approximate,
+        stopwords=stopwords if stopwords is not None else DEFAULT_STOPWORDS,
+        capacity=capacity,
+        precision=precision,
+    )
+
+
+def _next_bytes_cut(data, lo: int, hi: int) -> int:
+    """Return the last cut point in ``data[lo:hi]``, looking further than
+    *hi* only if there is none (or ``len(data)`` if the rest has none)."""
+    n = len(data)
+    while True:
+        if hi >= n:
+            return n
+        for pattern in (_BYTES_CUT_RE, _BYTES_NON_WORD_RE):
+            window = 256
+            while True:
+                start = max(lo, hi - window)
+                last = None
+                for last in pattern.finditer(data, start, hi):
+                    pass
+                if last is not None:
+                    return last.end()
+                if start == lo:
+                    break
+                window *= 16
+        lo, hi = hi, hi + (hi - lo)
+
+
+@lru_cache(maxsize=None)
+def _check_ascii_compatible(encoding: str) -> None:
+    """Raise ValueError unless ASCII bytes always mean ASCII in *encoding*.
+
+    The bytes scanner cuts blocks at ASCII whitespace and counts ASCII
+    blocks without decoding, which is only sound when ASCII encodes to
+    itself and no multi-byte sequence contains ASCII bytes (UTF-8 and the
+    single-byte codecs qualify; UTF-16 and Shift-JIS do not).
+    """
+    ascii_bytes = bytes(range(128))
+    try:
+        compatible = ascii_bytes.decode(encoding) == ascii_bytes.decode("ascii")
+        # Non-ASCII text must not encode to ASCII bytes (e.g. ISO-2022 escapes).
+        sample = "\u00e9\u0436\u65e5\u672c\u20ac".encode(encoding, "ignore")
+        compatible = compatible and all(b >= 0x80 for b in sample)
+        for lead in range(0x80, 0x100):
+            for trail in b" 0@Aa":
+                decoded = bytes((lead, trail)).decode(encoding, "replace")
+                compatible = compatible and decoded.endswith(chr(trail))
+    except (LookupError, UnicodeError):
+        compatible = False
+    if not compatible:
+        raise ValueError(f"scan_bytes needs an ASCII-compatible encoding, not {encoding!r}")
+
+
+def scan_bytes(
+    data,
+    block_size: int = SCAN_BLOCK_SIZE,
+    encoding: str = "utf-8",
+    **options,
+) -> TextCounts:
+    """Compute ``TextCounts`` straight from encoded text.
+
+    *data* is any bytes-like object that supports regexes and slicing --
+    ``bytes``, ``bytearray`` or an ``mmap``.  It is cut into blocks of
+    about *block_size* bytes at ASCII whitespace.  ASCII blocks are counted
+    without decoding: a translation table lowercases letters and blanks
+    everything else, so ``split()`` yields the tokens.  Blocks with other
+    bytes are decoded with *encoding* and scanned as text.  The result is
+    identical to ``scan_text(data.decode(encoding))``.  *encoding* must
+    be ASCII-compatible (ValueError otherwise).  *options* are those of
+    ``scan_chunks``.
+    """
+    _check_ascii_compatible(encoding)
+    scanner = _new_scanner(**options)
+    start = 0
+    while start < len(data):
+        cut = _next_bytes_cut(data, start, start + block_size)
+        scanner.scan_bytes(data, start, cut, encoding)
+        start = cut
+    return scanner.finish()
+
+
+def iter_file_chunks(
+    filepath: str,
+    chunk_size: int = SCAN_BLOCK_SIZE,
+    encoding: str = "utf-8",
+):
+    """Yield a text file as fixed-size decoded chunks (generator)."""
+    with open(filepath, encoding=encoding) as fh:
+        while chunk := fh.read(chunk_size):
+            yield chunk
+
+
+def scan_file(
+    filepath: str,
+    chunk_size: int = SCAN_BLOCK_SIZE,
+    encoding: str = "utf-8",
+    use_mmap: bool = False,
+    **options,
+) -> TextCounts:
+    """Stream a file of any size through the scanner.
+
+    Unlike ``TextAnalyzer.from_file`` the file is never loaded whole, so
+    this works on files larger than RAM::
+
+        counts = scan_file("export.log")
+        print(counts.to_stats(DEFAULT_STOPWORDS))
+        print(counts.to_readability())
+
+    With *use_mmap* the file is memory-mapped and counted by
+    ``scan_bytes``, which skips decoding for ASCII content (and needs an
+    ASCII-compatible *encoding*).  *options* are
+    passed on to ``scan_chunks`` (e.g. ``approximate=True``).
+    """
+    if use_mmap:
+        _check_ascii_compatible(encoding)
+        with open(filepath, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:  # mmap rejects empty files
+                return scan_bytes(b"", **options)
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return scan_bytes(mm, chunk_size, encoding, **options)
+    return scan_chunks(iter_file_chunks(filepath, chunk_size, encoding), **options)
+
+
+# ---------------------------------------------------------------------------
+# Positional index
+# ---------------------------------------------------------------------------
+
+# The line boundaries str.splitlines() recognizes.
+_LINE_END_RE = re.compile(r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+# Non-ASCII characters that re.IGNORECASE treats as equal to an ASCII
+# letter (dotted/dotless i, long s, Kelvin sign).  Lines containing them
+# are always checked, since the token index cannot see such matches.
+_CASE_FOLD_SPECIALS_RE = re.compile("[\u0130\u0131\u017f\u212a]")
+
+
+class _PositionalIndex:
+    """Token ids, positions and line offsets for one text, built in one pass.
+
+    Each distinct lowercase word is stored once, in ``words``; the text
+    itself becomes ``token_ids``, an ``array('I')`` of indexes into it
+    (``vocab`` maps a word back to its id), so a token costs a few bytes
+    instead of a str reference and an int object.  ``postings[id]`` lists
+    the indexes of a word in ``token_ids`` and ``token_lines[i]`` is the
+    0-based line of token ``i``, so a lookup costs time proportional to
+    the number of occurrences.  Strings are decoded only for output.
+    All of these only grow at the end, so ``extend`` indexes appended
+    text without touching what came before.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = ""
+        self.line_starts = array("Q")
+        self.line_ends = array("Q")
+        self.vocab: dict[str, int] = {}
+        self.words: list[str] = []
+        self.token_ids = array("I")
+        self.token_lines = array("I")
+        self.postings: list[array] = []
+        self.special_lines: list[int] = []
+        self.extend(text)
+
+    def extend(self, text: str) -> None:
+        """Index *text*, which must start with the text indexed so far.
+
+        Only the new lines are scanned, plus the last old line when it may
+        continue: it had no line break yet, or ended in ``\r`` that the new
+        text can turn into ``\r\n``.  Words that only occurred in that
+        line keep their (now empty) postings.
+        """
+        start = len(self.text)
+        if self.line_ends and (
+            self.line_ends[-1] == start
+            or (self.line_ends[-1] == start - 1 and self.text[-1] == "\r")
+        ):
+            start = self._pop_line()
+        self.text = text
+
+        first_line = len(self.line_starts)
+        for m in _LINE_END_RE.finditer(text, start):
+            self._add_line(start, m.start())
+            start = m.end()
+        if start < len(text):
+            self._add_line(start, len(text))
+
+        special_lines = self.special_lines
+        while special_lines and special_lines[-1] >= first_line:
+            special_lines.pop()
+        if first_line < len(self.line_starts):
+            special_lines.extend(sorted({
+                bisect_right(self.line_starts, m.start()) - 1
+                for m in _CASE_FOLD_SPECIALS_RE.finditer(
+                    text, self.line_starts[first_line]
+                )
+            }))
+
+    def _pop_line(self) -> int:
+        """Remove the last line and its tokens; return where it started."""
+        line_no = len(self.line_starts) - 1
+        first = bisect_left(self.token_lines, line_no)
+        postings = self.postings
+        for word_id in self.token_ids[first:]:
+            postings[word_id].pop()
+        del self.token_ids[first:]
+        del self.token_lines[first:]
+        self.line_ends.pop()
+        return self.line_starts.pop()
+
+    def _add_line(self, start: int, end: int) -> None:
+        line_no = len(self.line_starts)
+        self.line_starts.append(start)
+        self.line_ends.append(end)
+        vocab = self.vocab
+        postings = self.postings
+        token_ids = self.token_ids
+        first = len(token_ids)
+        for word in _WORD_RE.findall(self.text, start, end):
+            word = word.lower()
+            word_id = vocab.get(word)
+            if word_id is None:
+                word_id = vocab[word] = len(self.words)
+                self.words.append(word)
+                postings.append(array("I"))
+            postings[word_id].append(len(token_ids))
+            token_ids.append(word_id)
+        self.token_lines.extend(repeat(line_no, len(token_ids) - first))
+
+    def line(self, line_no: int) -> str:
+        return self.text[self.line_starts[line_no]:self.line_ends[line_no]]
+
+    def occurrences(self, word: str) -> array:
+        """Return the token indexes of *word* (case-insensitive)."""
+        word_id = self.vocab.get(word.lower())
+        return self.postings[word_id] if word_id is not None else array("I")
+
+    def decode(self, start: int, end: int) -> list[str]:
+        """Return the words of tokens ``start`` up to ``end``."""
+        words = self.words
+        return [words[i] for i in self.token_ids[start:end]]
+
+    def candidate_lines(self, literal: str) -> list[int]:
+        """Return the 0-based lines that may contain *literal*.
+
+        *literal* must consist of word characters only, so any
+        case-insensitive match lies inside a single token.
+        """
+        literal = literal.lower()
+        lines = set(self.special_lines)
+        token_lines = self.token_lines
+        for word, word_id in self.vocab.items():
+            if literal in word:
+                lines.update(token_lines[i] for i in self.postings[word_id])
+        return sorted(lines)
+
+
+# ---------------------------------------------------------------------------
+# On-disk index
+# ---------------------------------------------------------------------------
+
+# File layout: magic, u64 little-endian header length, JSON header, then
+# the sections, each starting on an 8-byte boundary.  The header records
+# the scalar counts and, per section, its offset (from the end of the
+# header), byte length and array typecode.  Strings are stored once, as
+# newline-terminated UTF-8 in a blob with an offsets array beside it.
+_INDEX_MAGIC = b"TXTIDX01"
+_INDEX_ALIGN = 8
+_INDEX_COUNTS = (
+    "word_count", "sentence_count", "char_count", "letter_count", "syllable_count",
+)
+
+
+def _string_table(words) -> tuple[bytes, array]:
+    """Pack *words* into a blob plus ``len(words) + 1`` end offsets."""
+    blob = bytearray()
+    offsets = array("Q", [0])
+    for word in words:
+        blob += word.encode("utf-8", "surrogatepass")
+        blob += b"\n"
+        offsets.append(len(blob))
+    return bytes(blob), offsets
+
+
+def write_index(analyzer: "TextAnalyzer", path: str) -> None:
+    """Persist everything ``TextAnalyzer.open`` serves to *path*.
+
+    The vocabulary is written in sorted order (token ids are renumbered
+    to match) so a mapped index finds a word by binary search, and word
+    frequencies in ``most_common`` order so top words need only the head
+    of the table.
+    """
+    text = analyzer.text
+    index = analyzer._get_index()
+    if not isinstance(index, _PositionalIndex):  # re-saving a mapped index
+        index = _PositionalIndex(text)
+    counts = analyzer.counts()
+    order = sorted(range(len(index.words)), key=index.words.__getitem__)
+    new_id = array("I", bytes(4 * len(order)))
+    for rank, old in enumerate(order):
+        new_id[old] = rank
+    postings_offsets = array("Q", [0])
+    postings = array("I")
+    for old in order:
+        postings.extend(index.postings[old])
+        postings_offsets.append(len(postings))
+    encoded = text.encode("utf-8", "surrogatepass")
+    # Byte offsets of the lines, so one line decodes without the rest.
+    if len(encoded) == len(text):
+        line_byte_starts, line_byte_ends = index.line_starts, index.line_ends
+    else:
+        line_byte_starts = array("Q")
+        line_byte_ends = array("Q")
+        pos = char_pos = 0
+        for start, end in zip(index.line_starts, index.line_ends):
+            pos += len(text[char_pos:start].encode("utf-8", "surrogatepass"))
+            line_byte_starts.append(pos)
+            pos += len(text[start:end].encode("utf-8", "surrogatepass"))
+            line_byte_ends.append(pos)
+            char_pos = end
+    words_blob, words_offsets = _string_table(index.words[i] for i in order)
+    top = counts.freq.most_common()
+    freq_blob, freq_offsets = _string_table(w for w, _ in top)
+    sections = {
+        "text": encoded,
+        "line_starts": index.line_starts,
+        "line_ends": index.line_ends,
+        "line_byte_starts": line_byte_starts,
+        "line_byte_ends": line_byte_ends,
+        "special_lines": array("I", index.special_lines),
+        "words": words_blob,
+        "words_offsets": words_offsets,
+        "token_ids": array("I", map(new_id.__getitem__, index.token_ids)),
+        "token_lines": index.token_lines,
+        "postings": postings,
+        "postings_offsets": postings_offsets,
+        "freq_words": freq_blob,
+        "freq_words_offsets": freq_offsets,
+        "freq_counts": array("Q", (c for _, c in top)),
+        "sentence_spans": array("Q", chain.from_iterable(analyzer.sentence_spans())),
+    }
+    table = {}
+    offset = 0
+    for name, data in sections.items():
+        nbytes = len(data) * (data.itemsize if isinstance(data, array) else 1)
+        typecode = data.typecode if isinstance(data, array) else "B"
+        table[name] = [offset, nbytes, typecode]
+        offset += -(-nbytes // _INDEX_ALIGN) * _INDEX_ALIGN
+    header = json.dumps({
+        "byteorder": sys.byteorder,
+        "digest": analyzer._text_hash[0].hex(),
+        "counts": {name: getattr(counts, name) for name in _INDEX_COUNTS},
+        "sections": table,
+    }).encode()
+    header += b" " * (-(len(_INDEX_MAGIC) + 8 + len(header)) % _INDEX_ALIGN)
+    # Write a sibling file and rename it into place: analyzers that still
+    # map the old index keep reading the old inode instead of a file
+    # truncated under them (which would crash with SIGBUS).
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "xb") as fh:
+            fh.write(_INDEX_MAGIC)
+            fh.write(len(header).to_bytes(8, "little"))
+            fh.write(header)
+            for name, data in sections.items():
+                nbytes = table[name][1]
+                fh.write(data)
+                fh.write(b"\0" * (-nbytes % _INDEX_ALIGN))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class _MappedStrings:
+    """Read-only sequence over a string table in a mapped index."""
+
+    __slots__ = ("_mm", "_base", "_end", "_offsets")
+
+    def __init__(self, mm: mmap.mmap, base: int, end: int, offsets) -> None:
+        self._mm = mm
+        self._base = base
+        self._end = end
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < len(self):
+            raise IndexError("string table index out of range")
+        start = self._base + self._offsets[i]
+        end = self._base + self._offsets[i + 1] - 1
+        return self._mm[start:end].decode("utf-8", "surrogatepass")
+
+    def containing(self, fragment: str) -> list[int]:
+        """Ids of the strings that contain *fragment* (no newline in it)."""
+        needle = fragment.encode("utf-8", "surrogatepass")
+        offsets, base, mm = self._offsets, self._base, self._mm
+        found = []
+        pos = mm.find(needle, base, self._end)
+        while pos != -1:
+            i = bisect_right(offsets, pos - base) - 1
+            found.append(i)
+            pos = mm.find(needle, base + offsets[i + 1], self._end)
+        return found
+
+
+class _MappedIndex:
+    """An index file mapped into memory, read in place.
+
+    Offers the ``_PositionalIndex`` interface (lines, token ids,
+    occurrences, candidate lines) plus the stored counts, so an analyzer
+    opened from the file answers ``stats``, ``readability``, ``search``
+    and ``concordance`` by touching only the pages those calls need.
+    Call ``close()`` (or use it as a context manager) to release the map.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as fh:
+            if fh.read(len(_INDEX_MAGIC)) != _INDEX_MAGIC:
+                raise ValueError(f"{path} is not a text analyzer index")
+            header_len = int.from_bytes(fh.read(8), "little")
+            header = json.loads(fh.read(header_len))
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._base = len(_INDEX_MAGIC) + 8 + header_len
+        self._sections = header["sections"]
+        self._swap = header["byteorder"] != sys.byteorder
+        self.digest = bytes.fromhex(header["digest"])
+        self.counts_header = header["counts"]
+
+        self._views: list[memoryview] = []  # released by close()
+        self.line_starts = self._array("line_starts")
+        self.line_ends = self._array("line_ends")
+        self._line_byte_starts = self._array("line_byte_starts")
+        self._line_byte_ends = self._array("line_byte_ends")
+        self.special_lines = self._array("special_lines")
+        self.words = self._strings("words")
+        self.token_ids = self._array("token_ids")
+        self.token_lines = self._array("token_lines")
+        self._postings = self._array("postings")
+        self._postings_offsets = self._array("postings_offsets")
+        self._freq_words = self._strings("freq_words")
+        self._freq_counts = self._array("freq_counts")
+        self._spans = self._array("sentence_spans")
+
+    def _bounds(self, name: str) -> tuple[int, int]:
+        offset, nbytes, _ = self._sections[name]
+        start = self._base + offset
+        return start, start + nbytes
+
+    def _array(self, name: str):
+        start, end = self._bounds(name)
+        view = memoryview(self._mm)[start:end].cast(self._sections[name][2])
+        if not self._swap:
+            self._views.append(view)
+            return view
+        # Written on a machine of the other byte order: copy and swap.
+        data = array(view.format, view.tobytes())
+        data.byteswap()
+        return data
+
+    def close(self) -> None:
+        """Release the views and unmap the file; reads afterwards fail.
+
+        Raises ``BufferError`` while a view handed out by this index (a
+        postings slice, a ``sentence_spans`` iterator) is still alive.
+        """
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        self._mm.close()
+
+    def __enter__(self) -> "_MappedIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _strings(self, name: str) -> _MappedStrings:
+        start, end = self._bounds(name)
+        return _MappedStrings(self._mm, start, end, self._array(name + "_offsets"))
+
+    @property
+    def text(self) -> str:
+        start, end = self._bounds("text")
+        return self._mm[start:end].decode("utf-8", "surrogatepass")
+
+    def line(self, line_no: int) -> str:
+        base = self._bounds("text")[0]
+        start = base + self._line_byte_starts[line_no]
+        end = base + self._line_byte_ends[line_no]
+        return self._mm[start:end].decode("utf-8", "surrogatepass")
+
+    def _postings_of(self, word_id: int):
+        offsets = self._postings_offsets
+        return self._postings[offsets[word_id]:offsets[word_id + 1]]
+
+    def occurrences(self, word: str):
+        word = word.lower()
+        word_id = bisect_left(self.words, word)
+        if word_id < len(self.words) and self.words[word_id] == word:
+            return self._postings_of(word_id)
+        return array("I")
+
+    def decode(self, start: int, end: int) -> list[str]:
+        words = self.words
+        return [words[i] for i in self.token_ids[start:end]]
+
+    def candidate_lines(self, literal: str) -> list[int]:
+        lines = set(self.special_lines)
+        token_lines = self.token_lines
+        for word_id in self.words.containing(literal.lower()):
+            lines.update(token_lines[i] for i in self._postings_of(word_id))
+        return sorted(lines)
+
+    def sentence_spans(self):
+        spans = self._spans
+        return zip(spans[::2], spans[1::2])
+
+    def _scalar_counts(self) -> TextCounts:
+        return TextCounts(**self.counts_header)
+
+    def counts(self) -> TextCounts:
+        """Rebuild the full ``TextCounts`` (reads the whole frequency table)."""
+        counts = self._scalar_counts()
+        counts.freq = Counter(dict(zip(self._freq_words, self._freq_counts)))
+        return counts
+
+    def to_stats(self, stopwords: set[str], top_n: int = 10) -> TextStats:
+        """Same as ``counts().to_stats()``, reading only the table's head."""
+        stats = self._scalar_counts().to_stats(stopwords, 0)
+        stats.unique_words = len(self._freq_words)
+        top = stats.top_words = []
+        for word, count in zip(self._freq_words, self._freq_counts):
+            if top_n is not None and len(top) >= top_n:
+                break
+            if word not in stopwords:
+                top.append((word, count))
+        return stats
+
+    def to_readability(self) -> ReadabilityScore:
+        return self._scalar_counts().to_readability()
+
+
+# ---------------------------------------------------------------------------
+# Multi-pattern search
+# ---------------------------------------------------------------------------
+
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+_LINE_END_CHARS = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+_ASCII_LOWER = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"
+)
+SEARCH_PLAN_CACHE_SIZE = 32
+
+
+@lru_cache(maxsize=256)
+def _compile_search(pattern: str) -> re.Pattern:
+    """Compile a case-insensitive search pattern once per distinct pattern."""
+    return re.compile(pattern, re.IGNORECASE)
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton: find every occurrence of many literals in
+    one left-to-right pass, independent of the number of terms.
+
+    ``out[state]`` already includes the outputs reachable through failure
+    links, so matching never walks the failure chain to report hits.
+    """
+
+    def __init__(self, terms: list[str]) -> None:
+        self.terms = terms
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[tuple[int, ...]] = [()]
+
+        for term_id, term in enumerate(terms):
+            state = 0
+            for ch in term:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                state = nxt
+            self.out[state] += (term_id,)
+
+        # Breadth-first: a node's failure target is always shallower.
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.out[nxt] += self.out[self.fail[nxt]]
+
+    def finditer(self, text: str):
+        """Yield ``(end, term_id)`` for every (possibly overlapping) hit."""
+        goto, fail, out = self.goto, self.fail, self.out
+        root = goto[0]
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0) if state else root.get(ch, 0)
+            if out[state]:
+                for term_id in out[state]:
+                    yield i + 1, term_id
+
+
+@dataclass
+class _SearchPlan:
+    """Compiled form of one set of patterns, cached by ``search_many``."""
+    automaton: AhoCorasick | None
+    literal_patterns: list[list[str]]  # term id -> patterns with that term
+    regexes: dict[str, re.Pattern]     # non-literal pattern -> compiled
+    prefilter: re.Pattern | None       # alternation of all regexes
+
+
+def _is_literal(pattern: str) -> bool:
+    return (
+        pattern != ""
+        and pattern.isascii()
+        and not _REGEX_META.intersection(pattern)
+        and not _LINE_END_CHARS.intersection(pattern)
+    )
+
+
+_search_plans: OrderedDict[frozenset[str], _SearchPlan] = OrderedDict()
+
+
+def _get_search_plan(patterns: frozenset[str]) -> _SearchPlan:
+    """Return the compiled plan for *patterns* from a small LRU."""
+    plan = _search_plans.get(patterns)
+    if plan is not None:
+        _search_plans.move_to_end(patterns)
+        return plan
+
+    by_term: dict[str, list[str]] = {}
+    regexes: dict[str, re.Pattern] = {}
+    for pattern in sorted(patterns):
+        if _is_literal(pattern):
+            by_term.setdefault(pattern.lower(), []).append(pattern)
+        else:
+            regexes[pattern] = _compile_search(pattern)
+
+    prefilter = None
+    if len(regexes) > 1:
+        try:
+            prefilter = re.compile(
+                "|".join(f"(?:{p})" for p in regexes), re.IGNORECASE
+            )
+        except re.error:
+            # Back-references or inline global flags do not survive being
+            # combined; fall back to testing each regex on every line.
+            prefilter = None
+        if prefilter is not None and prefilter.groups != sum(
+            r.groups for r in regexes.values()
+        ):
+            prefilter = None
+
+    terms = list(by_term)
+    plan = _SearchPlan(
+        automaton=AhoCorasick(terms) if terms else None,
+        literal_patterns=[by_term[t] for t in terms],
+        regexes=regexes,
+        prefilter=prefilter,
+    )
+    _search_plans[patterns] = plan
+    if len(_search_plans) > SEARCH_PLAN_CACHE_SIZE:
+        _search_plans.popitem(last=False)
+    return plan
+
+
+# ---------------------------------------------------------------------------
+# N-grams and collocations
+# ---------------------------------------------------------------------------
+
+NGRAM_ID_BITS = 32  # n-gram keys pack each token id into 32 bits
+CMS_WIDTH = 1 << 16
+CMS_DEPTH = 4
+NGRAM_CANDIDATES = 4096
+NGRAM_BATCH_SIZE = 1 << 16
+_CMS_PRIME = (1 << 127) - 1
+
+
+def _cms_seed(label: str) -> int:
+    digest = hashlib.blake2b(label.encode(), digest_size=16, person=b"count-min")
+    return int.from_bytes(digest.digest(), "big") % _CMS_PRIME or 1
+
+
+class CountMinSketch:
+    """Count-min sketch over non-negative int keys.
+
+    ``depth`` rows of ``width`` counters.  A key's estimate is the minimum
+    of its counters: it never undercounts, and overcounts by at most
+    ``error`` (``e * total / width``) with probability ``1 - e**-depth``.
+    """
+
+    def __init__(self, width: int = CMS_WIDTH, depth: int = CMS_DEPTH) -> None:
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+        # Fixed seeds below the 127-bit prime (so products wrap and every
+        # key bit reaches the slot), shared by sketches in all processes.
+        self._seeds = [
+            (_cms_seed(f"a{i}"), _cms_seed(f"b{i}")) for i in range(depth)
+        ]
+
+    def _slots(self, key: int) -> list[int]:
+        width = self.width
+        return [(a * key + b) % _CMS_PRIME % width for a, b in self._seeds]
+
+    def add(self, key: int, count: int = 1) -> int:
+        """Add *count* to *key* and return its new estimate."""
+        self.total += count
+        estimate = None
+        for row, slot in zip(self.rows, self._slots(key)):
+            row[slot] += count
+            if estimate is None or row[slot] < estimate:
+                estimate = row[slot]
+        return estimate
+
+    def estimate(self, key: int) -> int:
+        return min(row[slot] for row, slot in zip(self.rows, self._slots(key)))
+
+    @property
+    def error(self) -> int:
+        return math.ceil(math.e * self.total / self.width)
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("cannot merge count-min sketches of different shape")
+        merged = CountMinSketch(self.width, self.depth)
+        merged.total = self.total + other.total
+        merged.rows = [
+            array("Q", map(operator.add, a, b)) for a, b in zip(self.rows, other.rows)
+        ]
+        return merged
+
+
+def _pmi(c_xy: int, c_x: int, c_y: int, n: int) -> float:
+    """Pointwise mutual information, in bits."""
+    return math.log2(c_xy * n / (c_x * c_y))
+
+
+def _log_likelihood(c_xy: int, c_x: int, c_y: int, n: int) -> float:
+    """Dunning's log-likelihood ratio (G^2) for a bigram's 2x2 table."""
+    observed = (c_xy, c_x - c_xy, c_y - c_xy, n - c_x - c_y + c_xy)
+    # Expected cell counts, each multiplied by n.
+    expected = (c_x * c_y, c_x * (n - c_y), (n - c_x) * c_y, (n - c_x) * (n - c_y))
+    return 2 * sum(
+        o * math.log(o * n / e) for o, e in zip(observed, expected) if o > 0 and e > 0
+    )
+
+
+COLLOCATION_MEASURES = {"pmi": _pmi, "llr": _log_likelihood}
+
+
+class NgramCounter:
+    """Streaming word n-gram counter over integer token ids.
+
+    Words are interned to ids as they arrive and each n-gram is packed
+    into one int (ids ``NGRAM_ID_BITS`` bits apart), so the table holds
+    small ints instead of tuples of strings.  ``update()`` may be called
+    repeatedly; n-grams spanning two calls are counted.
+
+    With ``approximate=True`` counts go into a ``CountMinSketch`` and only
+    the current top *candidates* n-grams are tracked, capping memory on
+    huge inputs; reported counts may then be high by up to ``error``.
+
+    *vocab* seeds the ids (``vocab[i]`` gets id ``i``), so token ids that
+    were already encoded against it can go straight to ``update_ids()``.
+    """
+
+    def __init__(
+        self,
+        n: int = 2,
+        approximate: bool = False,
+        width: int = CMS_WIDTH,
+        depth: int = CMS_DEPTH,
+        candidates: int = NGRAM_CANDIDATES,
+        vocab: list[str] | None = None,
+    ) -> None:
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        self.n = n
+        # Unknown words get the next id (the vocabulary's current size).
+        self.vocab: defaultdict[str, int] = defaultdict(
+            None, zip(vocab or (), range(len(vocab or ())))
+        )
+        self.vocab.default_factory = self.vocab.__len__
+        self.unigrams: Counter = Counter()  # token id -> count
+        self.total = 0  # n-grams counted
+        self._words: list[str] = []
+        self._carry = array("I")
+        self._counts: Counter = Counter()
+        self._sketch = CountMinSketch(width, depth) if approximate else None
+        self._candidates: dict[int, int] = {}
+        self._max_candidates = candidates
+
+    @property
+    def approximate(self) -> bool:
+        return self._sketch is not None
+
+    @property
+    def error(self) -> int:
+        """Most any reported count may exceed the true count."""
+        return self._sketch.error if self._sketch is not None else 0
+
+    def update(self, words) -> None:
+        """Count the n-grams of *words*, continuing from the previous call."""
+        self.update_ids(array("I", map(self.vocab.__getitem__, words)))
+
+    def update_ids(self, fresh: array) -> None:
+        """Like ``update()``, for words already encoded as ids of ``vocab``."""
+        self.unigrams.update(fresh)
+        ids = self._carry + fresh
+        m = len(ids) - self.n + 1
+        if m <= 0:
+            self._carry = ids
+            return
+        keys = iter(ids[:m])  # consumed in batches below, even when n == 1
+        for i in range(1, self.n):
+            keys = map(
+                operator.or_,
+                map(operator.lshift, keys, repeat(NGRAM_ID_BITS)),
+                ids[i:i + m],
+            )
+        self._carry = ids[m:]
+        self.total += m
+        if self._sketch is None:
+            self._counts.update(keys)
+            return
+        # Pre-aggregate a batch at a time so memory stays bounded.
+        sketch = self._sketch
+        while batch := Counter(islice(keys, NGRAM_BATCH_SIZE)):
+            candidates = self._candidates
+            for key, c in batch.items():
+                candidates[key] = sketch.add(key, c)
+            if len(candidates) > 2 * self._max_candidates:
+                self._candidates = dict(heapq.nlargest(
+                    self._max_candidates, candidates.items(),
+                    key=operator.itemgetter(1),
+                ))
+
+    def _decode(self, key: int) -> tuple[str, ...]:
+        if len(self._words) != len(self.vocab):
+            self._words = list(self.vocab)
+        mask = (1 << NGRAM_ID_BITS) - 1
+        ids = []
+        for _ in range(self.n):
+            ids.append(key & mask)
+            key >>= NGRAM_ID_BITS
+        return tuple(self._words[i] for i in reversed(ids))
+
+    def _items(self):
+        if self._sketch is None:
+            return self._counts.items()
+        estimate = self._sketch.estimate
+        return ((key, estimate(key)) for key in self._candidates)
+
+    def count(self, ngram: tuple[str, ...]) -> int:
+        """Return the count of one n-gram (0 if unseen)."""
+        if len(ngram) != self.n:
+            raise ValueError(f"expected a {self.n}-gram")
+        key = 0
+        for word in ngram:
+            word_id = self.vocab.get(word)
+            if word_id is None:
+                return 0
+            key = (key << NGRAM_ID_BITS) | word_id
+        if self._sketch is None:
+            return self._counts[key]
+        return self._sketch.estimate(key)
+
+    def most_common(self, k: int | None = None) -> list[tuple[tuple[str, ...], int]]:
+        """Return the *k* most frequent n-grams (all when *k* is None)."""
+        if self._sketch is None:
+            top = self._counts.most_common(k)
+        else:
+            top = sorted(self._items(), key=operator.itemgetter(1), reverse=True)[:k]
+        return [(self._decode(key), c) for key, c in top]
+
+    def collocations(
+        self,
+        top_k: int = 10,
+        measure: str = "llr",
+        min_count: int = 2,
+    ) -> list[tuple[tuple[str, str], float]]:
+        """Rank bigrams by association strength.
+
+        *measure* is ``"pmi"`` (pointwise mutual information) or ``"llr"``
+        (log-likelihood ratio).  Bigrams seen fewer than *min_count* times
+        are skipped; PMI in particular overrates rare pairs.
+        """
+        if self.n != 2:
+            raise ValueError("collocations need a bigram counter (n=2)")
+        score = COLLOCATION_MEASURES.get(measure)
+        if score is None:
+            raise ValueError(
+                f"unknown measure {measure!r}; expected one of "
+                f"{sorted(COLLOCATION_MEASURES)}"
+            )
+        mask = (1 << NGRAM_ID_BITS) - 1
+        unigrams = self.unigrams
+        n = self.total
+        scored = []
+        for key, c_xy in self._items():
+            if c_xy < min_count:
+                continue
+            c_x, c_y = unigrams[key >> NGRAM_ID_BITS], unigrams[key & mask]
+            scored.append((key, score(min(c_xy, c_x, c_y), c_x, c_y, n)))
+        top = heapq.nlargest(top_k, scored, key=operator.itemgetter(1))
+        return [(self._decode(key), value) for key, value in top]
+
+    def merge(self, other: "NgramCounter") -> "NgramCounter":
+        """Return the combined counts of two exact counters.
+
+        Ids are re-interned into one vocabulary.  Approximate counters
+        cannot be merged: their sketches are keyed by per-counter ids.
+        """
+        if self.n != other.n:
+            raise ValueError("cannot merge counters of different n")
+        if self.approximate or other.approximate:
+            raise ValueError("approximate n-gram counters cannot be merged")
+        merged = NgramCounter(self.n)
+        mask = (1 << NGRAM_ID_BITS) - 1
+        for part in (self, other):
+            remap = array("I", map(merged.vocab.__getitem__, part.vocab))
+            merged.unigrams.update({remap[i]: c for i, c in part.unigrams.items()})
+            for key, c in part._counts.items():
+                new_key = 0
+                for shift in range((self.n - 1) * NGRAM_ID_BITS, -1, -NGRAM_ID_BITS):
+                    new_key = (new_key << NGRAM_ID_BITS) | remap[(key >> shift) & mask]
+                merged._counts[new_key] += c
+            merged.total += part.total
+        return merged
+
+
+# ---------------------------------------------------------------------------
+# Near-duplicate detection (MinHash + LSH)
+# ---------------------------------------------------------------------------
+
+MINHASH_PERMUTATIONS = 128
+SHINGLE_SIZE = 3
+LSH_BANDS = 16  # 16 bands of 8 rows: pairs above ~0.7 Jaccard collide
+SIGNATURE_CHUNK_SIZE = 1_000
+_MINHASH_PRIME = (1 << 61) - 1
+_MINHASH_MAGIC = b"MINHASH1\n"
+
+
+@lru_cache(maxsize=None)
+def _minhash_params(num_perm: int) -> tuple[tuple[int, int], ...]:
+    """The ``(a, b)`` pairs of the hash family ``(a * x + b) mod p``."""
+    params = []
+    for i in range(num_perm):
+        digest = hashlib.blake2b(
+            str(i).encode(), digest_size=16, person=b"minhash"
+        ).digest()
+        a = int.from_bytes(digest[:8], "big") % (_MINHASH_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], "big") % _MINHASH_PRIME
+        params.append((a, b))
+    return tuple(params)
+
+
+@lru_cache(maxsize=1 << 16)
+def _token_hash(word: str) -> int:
+    return _hash64(word) % _MINHASH_PRIME
+
+
+def _shingle_hashes(words, shingle_size: int = SHINGLE_SIZE) -> set[int]:
+    """Hash every run of *shingle_size* consecutive words.
+
+    A document shorter than one shingle is a single shingle of all its
+    words; an empty one has none.
+    """
+    tokens = [_token_hash(w) for w in words]
+    if len(tokens) < shingle_size:
+        shingle_size = len(tokens)
+    shingles = set()
+    for i in range(len(tokens) - shingle_size + 1 if tokens else 0):
+        h = 0
+        for t in tokens[i:i + shingle_size]:
+            h = (h * 1_000_003 + t) % _MINHASH_PRIME
+        shingles.add(h)
+    return shingles
+
+
+def minhash_signature(
+    words,
+    num_perm: int = MINHASH_PERMUTATIONS,
+    shingle_size: int = SHINGLE_SIZE,
+) -> array:
+    """MinHash signature of the word shingles of *words*.
+
+    The fraction of positions where two signatures agree estimates the
+    Jaccard similarity of the two shingle sets.  Hashes are seeded from
+    fixed digests, so signatures agree across processes and runs.
+    """
+    shingles = list(_shingle_hashes(words, shingle_size))
+    if not shingles:
+        return array("Q", repeat(_MINHASH_PRIME, num_perm))
+    p = _MINHASH_PRIME
+    return array("Q", [
+        min([(a * x + b) % p for x in shingles])
+        for a, b in _minhash_params(num_perm)
+    ])
+
+
+def signature_similarity(sig_a, sig_b) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    if len(sig_a) != len(sig_b):
+        raise ValueError("signatures differ in length")
+    return sum(map(operator.eq, sig_a, sig_b)) / len(sig_a)
+
+
+@dataclass
+class MinHashSignatures:
+    """Signatures of many documents, stored row-major in one array.
+
+    ``save``/``load`` persist them in a small binary file so a corpus
+    need only be shingled once.
+    """
+    num_perm: int = MINHASH_PERMUTATIONS
+    shingle_size: int = SHINGLE_SIZE
+    data: array = field(default_factory=lambda: array("Q"))
+
+    def __len__(self) -> int:
+        return len(self.data) // self.num_perm
+
+    def __getitem__(self, i: int) -> array:
+        if not -len(self) <= i < len(self):
+            raise IndexError("signature index out of range")
+        i %= len(self)
+        return self.data[i * self.num_perm:(i + 1) * self.num_perm]
+
+    def extend(self, other: "MinHashSignatures") -> None:
+        if (self.num_perm, self.shingle_size) != (other.num_perm, other.shingle_size):
+            raise ValueError("cannot combine signatures of different shape")
+        self.data.extend(other.data)
+
+    def save(self, path: str) -> None:
+        header = {
+            "num_perm": self.num_perm,
+            "shingle_size": self.shingle_size,
+            "count": len(self),
+            "byteorder": sys.byteorder,
+        }
+        with open(path, "wb") as fh:
+            fh.write(_MINHASH_MAGIC)
+            fh.write(json.dumps(header).encode() + b"\n")
+            self.data.tofile(fh)
+
+    @classmethod
+    def load(cls, path: str) -> "MinHashSignatures":
+        with open(path, "rb") as fh:
+            if fh.readline() != _MINHASH_MAGIC:
+                raise ValueError(f"{path} is not a MinHash signature file")
+            header = json.loads(fh.readline())
+            data = array("Q")
+            data.fromfile(fh, header["count"] * header["num_perm"])
+        if header["byteorder"] != sys.byteorder:
+            data.byteswap()
+        return cls(header["num_perm"], header["shingle_size"], data)
+
+
+def _signature_chunk(
+    texts: list[str], num_perm: int, shingle_size: int
+) -> MinHashSignatures:
+    """Worker: sign *texts* with the ``TextAnalyzer`` tokenizer."""
+    result = MinHashSignatures(num_perm, shingle_size)
+    findall = _WORD_RE.findall
+    for text in texts:
+        if text.isascii():
+            words = findall(text.lower())
+        else:
+            words = [w.lower() for w in findall(text)]
+        result.data.extend(minhash_signature(words, num_perm, shingle_size))
+    return result
+
+
+def compute_signatures(
+    texts,
+    jobs: int = 1,
+    chunk_size: int = SIGNATURE_CHUNK_SIZE,
+    num_perm: int = MINHASH_PERMUTATIONS,
+    shingle_size: int = SHINGLE_SIZE,
+) -> MinHashSignatures:
+    """MinHash-sign every text, over *jobs* processes when ``jobs > 1``.
+
+    Signature ``i`` is ``TextAnalyzer(texts[i]).minhash(num_perm,
+    shingle_size)``.
+    """
+    it = iter(texts)
+    chunks = iter(lambda: list(islice(it, chunk_size)), [])
+    work = partial(_signature_chunk, num_perm=num_perm, shingle_size=shingle_size)
+    result = MinHashSignatures(num_perm, shingle_size)
+    if jobs <= 1:
+        for chunk in chunks:
+            result.extend(work(chunk))
+        return result
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for part in pool.map(work, chunks):
+            result.extend(part)
+    return result
+
+
+class LSHIndex:
+    """Banded locality-sensitive hashing over MinHash signatures.
+
+    Each signature is cut into *bands* bands of ``num_perm // bands``
+    rows; documents sharing any whole band land in the same bucket.  A
+    pair with Jaccard similarity ``s`` becomes a candidate with
+    probability ``1 - (1 - s**rows)**bands``, so adding ``n`` documents
+    and clustering them costs ``O(n * bands)`` rather than ``O(n**2)``.
+    """
+
+    def __init__(self, num_perm: int = MINHASH_PERMUTATIONS, bands: int = LSH_BANDS) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.signatures = MinHashSignatures(num_perm)
+        self.buckets: list[dict[bytes, list[int]]] = [{} for _ in range(bands)]
+
+    @property
+    def threshold(self) -> float:
+        """Similarity at which a pair is a candidate with probability ~1/2."""
+        return (1 / self.bands) ** (1 / self.rows)
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _band_keys(self, signature: array):
+        rows = self.rows
+        for b in range(self.bands):
+            yield signature[b * rows:(b + 1) * rows].tobytes()
+
+    def add(self, signature: array) -> int:
+        """Index *signature*; return its document id (insertion order)."""
+        if len(signature) != self.num_perm:
+            raise ValueError("signature length does not match the index")
+        doc_id = len(self.signatures)
+        self.signatures.data.extend(signature)
+        for bucket, key in zip(self.buckets, self._band_keys(signature)):
+            bucket.setdefault(key, []).append(doc_id)
+        return doc_id
+
+    @classmethod
+    def from_signatures(
+        cls, signatures: MinHashSignatures, bands: int = LSH_BANDS
+    ) -> "LSHIndex":
+        index = cls(signatures.num_perm, bands)
+        for i in range(len(signatures)):
+            index.add(signatures[i])
+        return index
+
+    def candidates(self, signature: array) -> set[int]:
+        """Ids of indexed documents sharing at least one band with *signature*."""
+        found = set()
+        for bucket, key in zip(self.buckets, self._band_keys(signature)):
+            found.update(bucket.get(key, ()))
+        return found
+
+    def query(self, signature: array, threshold: float | None = None) -> list[tuple[int, float]]:
+        """Candidates whose estimated similarity reaches *threshold*, best first."""
+        threshold = self.threshold if threshold is None else threshold
+        hits = [
+            (doc_id, signature_similarity(signature, self.signatures[doc_id]))
+            for doc_id in self.candidates(signature)
+        ]
+        return sorted(
+            ((d, s) for d, s in hits if s >= threshold), key=lambda h: (-h[1], h[0])
+        )
+
+    def clusters(self, threshold: float | None = None) -> list[list[int]]:
+        """Group indexed documents into near-duplicate clusters.
+
+        Every bucket member is compared with the bucket's first document
+        and joined to it (union-find) when their estimated similarity
+        reaches *threshold* (default: the index's own ``threshold``);
+        ``threshold=0`` keeps every LSH candidate.  Only clusters of two
+        or more documents are returned, each sorted, largest first.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        parent = list(range(len(self)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        sig = self.signatures.__getitem__
+        for bucket in self.buckets:
+            for members in bucket.values():
+                if len(members) < 2:
+                    continue
+                head = members[0]
+                head_sig = sig(head)
+                for other in members[1:]:
+                    a, b = find(head), find(other)
+                    if a != b and signature_similarity(head_sig, sig(other)) >= threshold:
+                        parent[b] = a
+        groups = defaultdict(list)
+        for i in range(len(self)):
+            groups[find(i)].append(i)
+        return sorted(
+            (g for g in groups.values() if len(g) > 1), key=lambda g: (-len(g), g[0])
+        )
+
+
+def near_duplicates(
+    texts,
+    threshold: float | None = None,
+    jobs: int = 1,
+    num_perm: int = MINHASH_PERMUTATIONS,
+    bands: int = LSH_BANDS,
+    shingle_size: int = SHINGLE_SIZE,
+) -> list[list[int]]:
+    """Indices of *texts* grouped into near-duplicate clusters.
+
+    Examples
+    --------
+    >>> near_duplicates(["the cat sat on the mat", "a dog", "the cat sat on the mat"])
+    [[0, 2]]
+    """
+    signatures = compute_signatures(
+        texts, jobs=jobs, num_perm=num_perm, shingle_size=shingle_size
+    )
+    return LSHIndex.from_signatures(signatures, bands).clusters(threshold)
+
+
+# ---------------------------------------------------------------------------
+# Ranked retrieval (BM25)
+# ---------------------------------------------------------------------------
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class _Postings:
+    """One term's postings: ascending doc ids, their term frequencies, and
+    the two statistics its BM25 upper bound needs."""
+
+    __slots__ = ("docs", "tfs", "max_tf", "min_length")
+
+    def __init__(self) -> None:
+        self.docs = array("I")
+        self.tfs = array("I")
+        self.max_tf = 0
+        self.min_length = sys.maxsize
+
+
+class BM25Index:
+    """Inverted index answering BM25 top-k queries over many documents.
+
+    Documents are tokenized like ``TextAnalyzer`` and stopwords dropped;
+    each term keeps doc ids and term frequencies in ``array`` columns.
+    ``search`` walks the postings document-at-a-time with the MaxScore
+    strategy: terms whose combined upper bound cannot lift a document
+    into the current top *k* are never iterated, only probed (by binary
+    search) for documents the other terms already rank highly.  The
+    result is identical to scoring every document.
+    """
+
+    def __init__(
+        self,
+        stopwords: set[str] | None = None,
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+    ) -> None:
+        self.stopwords = DEFAULT_STOPWORDS if stopwords is None else stopwords
+        self.k1 = k1
+        self.b = b
+        self.keys: list = []
+        self.lengths = array("I")
+        self.total_length = 0
+        self.postings: dict[str, _Postings] = {}
+        self.errors: dict[str, str] = {}  # path -> error, from from_paths()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _terms(self, text: str) -> Counter:
+        if text.isascii():
+            words = _WORD_RE.findall(text.lower())
+        else:
+            words = [w.lower() for w in _WORD_RE.findall(text)]
+        stopwords = self.stopwords
+        return Counter(w for w in words if w not in stopwords)
+
+    def add(self, text: str, key=None) -> int:
+        """Index *text* under *key* (default: its doc id); return the doc id."""
+        doc_id = len(self.keys)
+        terms = self._terms(text)
+        length = sum(terms.values())
+        self.keys.append(doc_id if key is None else key)
+        self.lengths.append(length)
+        self.total_length += length
+        postings = self.postings
+        for term, tf in terms.items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = _Postings()
+            entry.docs.append(doc_id)
+            entry.tfs.append(tf)
+            if tf > entry.max_tf:
+                entry.max_tf = tf
+            if length < entry.min_length:
+                entry.min_length = length
+        return doc_id
+
+    @classmethod
+    def from_texts(cls, texts, **kwargs) -> "BM25Index":
+        index = cls(**kwargs)
+        for text in texts:
+            index.add(text)
+        return index
+
+    @classmethod
+    def from_paths(
+        cls, paths, suffix: str = ".txt", encoding: str = "utf-8", **kwargs
+    ) -> "BM25Index":
+        """Index every file under *paths*, keyed by its path.
+
+        Files that cannot be read or decoded are skipped and recorded in
+        ``errors`` instead of aborting the build.
+        """
+        index = cls(**kwargs)
+        for path in CorpusAnalyzer.iter_files(paths, suffix):
+            try:
+                text = _read_file(path, encoding)
+            except (OSError, UnicodeDecodeError) as exc:
+                index.errors[path] = f"{type(exc).__name__}: {exc}"
+                continue
+            index.add(text, key=path)
+        return index
+
+    def idf(self, term: str) -> float:
+        entry = self.postings.get(term)
+        df = len(entry.docs) if entry is not None else 0
+        return math.log(1 + (len(self) - df + 0.5) / (df + 0.5))
+
+    def _weight(self, avg_length: float):
+        """Return ``tf, length -> tf * (k1 + 1) / (tf + k1 * norm(length))``."""
+        k1 = self.k1
+        slope = k1 * self.b / avg_length
+        base = k1 * (1 - self.b)
+
+        def weight(tf: int, length: int) -> float:
+            return tf * (k1 + 1) / (tf + base + slope * length)
+
+        return weight
 
+    def score(self, query: str, doc_id: int) -> float:
+        """BM25 score of document *doc_id* for *query* (exhaustive, for checks)."""
+        if not self.total_length:
+            return 0.0
+        weight = self._weight(self.total_length / len(self))
+        length = self.lengths[doc_id]
+        total = 0.0
+        for term in self._terms(query):
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            i = bisect_left(entry.docs, doc_id)
+            if i < len(entry.docs) and entry.docs[i] == doc_id:
+                total += self.idf(term) * weight(entry.tfs[i], length)
+        return total
 
-# ---------------------------------------------------------------------------
-# Default stopwords
-# ---------------------------------------------------------------------------
+    def search(self, query: str, k: int = 10) -> list[tuple[object, float]]:
+        """Return the *k* best ``(key, score)`` pairs for *query*, best first.
 
-DEFAULT_STOPWORDS: set[str] = {
-    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
-    "of", "with", "by", "is", "am", "are", "was", "were", "be", "been",
-    "being", "have", "has", "had", "do", "does", "did", "will", "would",
-    "shall", "should", "may", "might", "must", "can", "could", "it", "its",
-    "i", "me", "my", "we", "us", "our", "you", "your", "he", "him", "his",
-    "she", "her", "they", "them", "their", "this", "that", "these", "those",
-    "not", "no", "nor", "so", "if", "then", "than", "too", "very", "just",
-    "about", "above", "after", "again", "all", "also", "as", "because",
-    "before", "between", "both", "each", "from", "into", "more", "most",
-    "other", "out", "over", "own", "same", "some", "such", "there", "through",
-    "under", "up", "what", "when", "where", "which", "while", "who", "whom",
-    "why", "how",
-}
+        Ties are broken by insertion order.  Query words are tokenized
+        and filtered like documents; repeated words count once.
+        """
+        if k <= 0 or not self.total_length:
+            return []
+        weight = self._weight(self.total_length / len(self))
+        lengths = self.lengths
+        # One cursor per query term: [upper bound, idf, docs, tfs, position].
+        cursors = []
+        for term in self._terms(query):
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            idf = self.idf(term)
+            bound = idf * weight(entry.max_tf, entry.min_length)
+            cursors.append([bound, idf, entry.docs, entry.tfs, 0])
+        cursors.sort(key=operator.itemgetter(0))
+        # prefix[i]: the most terms 0..i (the non-essential ones) can add.
+        prefix = list(accumulate(c[0] for c in cursors))
+        heap: list[tuple[float, int]] = []  # (score, -doc): worst on top
+        threshold = -1.0
+        first_essential = 0
+        while first_essential < len(cursors):
+            essential = cursors[first_essential:]
+            doc = min(
+                (c[2][c[4]] for c in essential if c[4] < len(c[2])), default=None
+            )
+            if doc is None:
+                break
+            length = lengths[doc]
+            score = 0.0
+            for c in essential:
+                pos = c[4]
+                if pos < len(c[2]) and c[2][pos] == doc:
+                    score += c[1] * weight(c[3][pos], length)
+                    c[4] = pos + 1
+            for i in range(first_essential - 1, -1, -1):
+                if score + prefix[i] <= threshold:
+                    break
+                c = cursors[i]
+                pos = c[4] = bisect_left(c[2], doc, c[4])
+                if pos < len(c[2]) and c[2][pos] == doc:
+                    score += c[1] * weight(c[3][pos], length)
+            if len(heap) < k:
+                heapq.heappush(heap, (score, -doc))
+            elif score > threshold:
+                heapq.heapreplace(heap, (score, -doc))
+            else:
+                continue
+            if len(heap) == k:
+                threshold = heap[0][0]
+                while first_essential < len(cursors) and prefix[first_essential] <= threshold:
+                    first_essential += 1
+        keys = self.keys
+        return [(keys[-d], s) for s, d in sorted(heap, key=lambda h: (-h[0], -h[1]))]
 
 
 # ---------------------------------------------------------------------------
@@ -155,13 +2533,87 @@ class TextAnalyzer:
         text: str = "",
         stopwords: set[str] | None = None,
     ) -> None:
-        self.text = text
+        self._pieces = [text]  # see append(); joined on first read of .text
         self.stopwords = stopwords if stopwords is not None else DEFAULT_STOPWORDS
-        # Pre-compute a hash so the cache decorator can detect changes.
-        # Include the sorted stopwords so different configurations get
-        # separate cache entries.
-        fingerprint = self.text + "\x00" + ",".join(sorted(self.stopwords))
-        self._text_hash = hashlib.md5(fingerprint.encode()).hexdigest()
+        # The fingerprint used by the cache decorator is computed lazily
+        # (see _text_hash), so analyzers that never hit the cache never
+        # hash their text.
+        self._hasher = None
+        self._fingerprint: tuple[bytes, bytes] | None = None
+        self._counts: TextCounts | None = None
+        self._scanner: _TextScanner | None = None
+        self._index: _PositionalIndex | None = None
+        self._mapped: _MappedIndex | None = None  # see open()
+
+    @property
+    def text(self) -> str:
+        if self._pieces is None:  # opened from an index file
+            self._pieces = [self._mapped.text]
+        if len(self._pieces) > 1:
+            self._pieces = ["".join(self._pieces)]
+        return self._pieces[0]
+
+    @text.setter
+    def text(self, value: str) -> None:
+        if self._mapped is not None:
+            self._detach_mapped()
+        self._pieces = [value]
+        self._hasher = None
+        self._fingerprint = None
+        self._counts = None
+        self._scanner = None
+        self._index = None
+        RESULT_CACHE.discard_owner(self)
+
+    def append(self, text: str) -> None:
+        """Append *text* to the document, updating aggregates in place.
+
+        Word, sentence, character, syllable and frequency counts absorb the
+        new text through the scanner kept by ``counts()`` -- a word or
+        sentence that continues across the boundary is counted once --
+        and the fingerprint hasher is fed only the new bytes, so each call
+        costs time proportional to ``len(text)``.  The positional index
+        catches up on the next search, indexing only the new lines, and
+        this analyzer's cached results are dropped.
+        """
+        if not text:
+            return
+        if self._mapped is not None:
+            self._pieces = [self.text]
+            self._detach_mapped()
+            self._counts = None
+        self._pieces.append(text)
+        if self._hasher is not None:
+            self._hasher.update(text.encode("utf-8", "surrogatepass"))
+        self._fingerprint = None
+        RESULT_CACHE.discard_owner(self)
+        if self._scanner is not None:
+            for i in range(0, len(text), SCAN_BLOCK_SIZE):
+                self._scanner.feed(text[i:i + SCAN_BLOCK_SIZE])
+            self._counts = self._scanner.snapshot()
+        else:
+            self._counts = None
+
+    @property
+    def _text_hash(self) -> tuple[bytes, bytes]:
+        """Fingerprint of the text and stopwords, computed on first use.
+
+        BLAKE2b is fast and incremental: the hasher is kept so appended
+        text can be folded in without rehashing what came before.  The
+        stopword digest is shared across analyzers, so different
+        stopword configurations get separate cache entries cheaply.
+        """
+        if self._fingerprint is None:
+            if self._mapped is not None:
+                digest = self._mapped.digest
+            else:
+                if self._hasher is None:
+                    self._hasher = hashlib.blake2b(
+                        self.text.encode("utf-8", "surrogatepass"), digest_size=16
+                    )
+                digest = self._hasher.digest()
+            self._fingerprint = (digest, _stopwords_digest(self.stopwords))
+        return self._fingerprint
 
     # -- Alternate constructor -----------------------------------------------
 
@@ -172,6 +2624,49 @@ class TextAnalyzer:
             text = fh.read()
         return cls(text, **kwargs)
 
+    @classmethod
+    def open(cls, index_path: str, **kwargs) -> "TextAnalyzer":
+        """Open an index written by ``save()`` without re-parsing the text.
+
+        The file is memory-mapped: ``stats``, ``readability``, ``search``
+        (word patterns), ``concordance`` and ``sentence_spans`` read the
+        stored tables in place, so opening costs the same for any corpus
+        size.  Anything else decodes the text on first use.
+        """
+        analyzer = cls(**kwargs)
+        analyzer._mapped = _MappedIndex(index_path)
+        analyzer._pieces = None
+        return analyzer
+
+    def save(self, index_path: str) -> None:
+        """Write the text and its analysis tables for ``open()``."""
+        write_index(self, index_path)
+
+    def close(self) -> None:
+        """Release the index file mapped by ``open()``, if any.
+
+        Results that still need the file raise ``ValueError`` afterwards.
+        A no-op for analyzers built from text.
+        """
+        if self._mapped is not None:
+            self._mapped.close()
+
+    def __enter__(self) -> "TextAnalyzer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _detach_mapped(self) -> None:
+        """Stop reading from the mapped index and release it."""
+        mapped, self._mapped = self._mapped, None
+        if self._index is mapped:
+            self._index = None
+        try:
+            mapped.close()
+        except BufferError:
+            pass  # a caller still holds a view; the map goes when it does
+
     # -- Generators ----------------------------------------------------------
 
     def _tokenize(self):
@@ -180,48 +2675,52 @@ class TextAnalyzer:
             for word in re.findall(r"[a-zA-Z']+", line):
                 yield word.lower()
 
+    def sentence_spans(self):
+        """Yield ``(start, end)`` offsets of each sentence in ``self.text``."""
+        if self._mapped is not None:
+            return self._mapped.sentence_spans()
+        return iter_sentence_spans(self._pieces)
+
     def _sentences(self):
         """Yield individual sentences split on sentence-ending punctuation."""
-        for sentence in re.split(r"(?<=[.!?])\s+", self.text.strip()):
-            sentence = sentence.strip()
-            if sentence:
-                yield sentence
+        text = self.text
+        for start, end in iter_sentence_spans((text,)):
+            yield text[start:end]
 
     # -- Analysis methods ----------------------------------------------------
 
-    @timer
-    @cache_result
-    def stats(self, top_n: int = 10) -> TextStats:
-        """Compute basic text statistics.
+    def counts(self) -> TextCounts:
+        """Return the raw aggregates, scanning the text on first use only.
 
-        Uses generators for tokenization, then materializes a word list once
-        to compute all metrics without re-scanning.
+        ``stats()`` and ``readability()`` both derive from this single
+        fused pass, so ``report()`` reads the text once.  The scanner is
+        kept so ``append()`` can extend the counts.
         """
-        words = list(self._tokenize())
-        sentences = list(self._sentences())
-
-        word_count = len(words)
-        sentence_count = len(sentences)
-        char_count = sum(1 for ch in self.text if not ch.isspace())
-
-        avg_word_length = (
-            sum(len(w) for w in words) / word_count if word_count else 0.0
-        )
+        if self._counts is None and self._mapped is not None:
+            self._counts = self._mapped.counts()
+        elif self._counts is None:
+            text = self.text
+            scanner = _TextScanner()
+            for i in range(0, len(text), SCAN_BLOCK_SIZE):
+                scanner.feed(text[i:i + SCAN_BLOCK_SIZE])
+            self._scanner = scanner
+            self._counts = scanner.snapshot()
+        return self._counts
 
-        # Frequency counts excluding stopwords
-        filtered = [w for w in words if w not in self.stopwords]
-        freq = Counter(filtered)
-        unique_words = len(set(words))
-        top_words = freq.most_common(top_n)
+    @timer
+    @cache_result(weak=True)
+    def stats(self, top_n: int = 10, approximate: bool = False) -> TextStats:
+        """Compute basic text statistics from the fused scan.
 
-        return TextStats(
-            word_count=word_count,
-            sentence_count=sentence_count,
-            char_count=char_count,
-            avg_word_length=round(avg_word_length, 2),
-            unique_words=unique_words,
-            top_words=top_words,
-        )
+        With ``approximate=True`` top words and unique words come from
+        fixed-size sketches and the result reports their error bounds.
+        """
+        if approximate:
+            counts = scan_text(self.text, approximate=True, stopwords=self.stopwords)
+            return counts.to_stats(self.stopwords, top_n)
+        if self._counts is None and self._mapped is not None:
+            return self._mapped.to_stats(self.stopwords, top_n)
+        return self.counts().to_stats(self.stopwords, top_n)
 
     @timer
     def readability(self) -> ReadabilityScore:
@@ -232,66 +2731,184 @@ class TextAnalyzer:
                   + 11.8 * (syllables / words)
                   - 15.59
         """
-        words = list(self._tokenize())
-        sentences = list(self._sentences())
-
-        total_words = len(words)
-        total_sentences = len(sentences) or 1  # avoid division by zero
-        total_syllables = sum(count_syllables(w) for w in words)
-
-        avg_sentence_length = total_words / total_sentences
-        avg_syllables = total_syllables / total_words if total_words else 0.0
+        if self._mapped is not None:
+            return self._mapped.to_readability()
+        return self.counts().to_readability()
 
-        grade = (
-            0.39 * avg_sentence_length
-            + 11.8 * avg_syllables
-            - 15.59
-        )
+    def _get_index(self) -> _PositionalIndex:
+        """Build the positional index on first use, then reuse it.
 
-        return ReadabilityScore(
-            flesch_kincaid_grade=round(grade, 1),
-            avg_sentence_length=round(avg_sentence_length, 1),
-            avg_syllables_per_word=round(avg_syllables, 2),
-        )
+        Text appended since the last call is indexed incrementally.
+        """
+        if self._index is None:
+            if self._mapped is not None:
+                self._index = self._mapped
+            else:
+                self._index = _PositionalIndex(self.text)
+        elif self._mapped is None and len(self._index.text) != len(self.text):
+            self._index.extend(self.text)
+        return self._index
 
+    @timer
     def search(self, pattern: str) -> list[tuple[int, str]]:
         """Search for a regex pattern and return matching lines.
 
         Returns a list of (line_number, line_text) tuples.  Line numbers are
-        1-based.
+        1-based.  A pattern made only of word characters is looked up in
+        the positional index, so lines that cannot match are skipped.
         """
-        compiled = re.compile(pattern, re.IGNORECASE)
+        compiled = _compile_search(pattern)
+        if _WORD_RE.fullmatch(pattern):
+            index = self._get_index()
+            results = []
+            for line_no in index.candidate_lines(pattern):
+                line = index.line(line_no)
+                if compiled.search(line):
+                    results.append((line_no + 1, line))
+            return results
+        if self._mapped is not None:
+            lines = map(self._mapped.line, range(len(self._mapped.line_starts)))
+        else:
+            lines = self.text.splitlines()
         return [
             (i, line)
-            for i, line in enumerate(self.text.splitlines(), start=1)
+            for i, line in enumerate(lines, start=1)
             if compiled.search(line)
         ]
 
+    @timer
+    def search_many(self, patterns) -> dict[str, list[tuple[int, str]]]:
+        """Search for many patterns at once.
+
+        Returns ``{pattern: [(line_number, line_text), ...]}`` with the same
+        results ``search(pattern)`` would give for each pattern.  Plain
+        literal terms are matched together by one Aho-Corasick pass over
+        the text; regex patterns share one pass over the lines, using their
+        combined alternation to skip lines none of them can match.
+        Compiled plans are cached per pattern set.
+        """
+        patterns = list(dict.fromkeys(patterns))
+        plan = _get_search_plan(frozenset(patterns))
+        index = self._get_index()
+        hits: dict[str, set[int]] = {p: set() for p in patterns}
+
+        if plan.automaton is not None:
+            line_starts = index.line_starts
+            n_lines = len(line_starts)
+            folded = self.text.translate(_ASCII_LOWER)
+            last_line = [-1] * len(plan.literal_patterns)
+            line_no = 0
+            # Hits arrive in text order, so the current line only moves
+            # forward and repeated hits on one line are adjacent.
+            for end, term_id in plan.automaton.finditer(folded):
+                while line_no + 1 < n_lines and line_starts[line_no + 1] < end:
+                    line_no += 1
+                if last_line[term_id] != line_no:
+                    last_line[term_id] = line_no
+                    for pattern in plan.literal_patterns[term_id]:
+                        hits[pattern].add(line_no)
+            # Characters that re.IGNORECASE folds onto ASCII letters.
+            for line_no in index.special_lines:
+                line = index.line(line_no)
+                for patterns_for_term in plan.literal_patterns:
+                    for pattern in patterns_for_term:
+                        if _compile_search(pattern).search(line):
+                            hits[pattern].add(line_no)
+
+        if plan.regexes:
+            prefilter = plan.prefilter
+            for line_no in range(len(index.line_starts)):
+                line = index.line(line_no)
+                if prefilter is not None and not prefilter.search(line):
+                    continue
+                for pattern, compiled in plan.regexes.items():
+                    if compiled.search(line):
+                        hits[pattern].add(line_no)
+
+        return {
+            pattern: [(n + 1, index.line(n)) for n in sorted(lines)]
+            for pattern, lines in hits.items()
+        }
+
+    @timer
     def concordance(self, word: str, context: int = 5) -> list[str]:
         """Show each occurrence of *word* surrounded by *context* words.
 
         Returns a list of strings like '... before WORD after ...'.
+        Occurrences come from the positional index, so each call costs
+        time proportional to the number of matches.
         """
-        words = list(self._tokenize())
-        target = word.lower()
+        index = self._get_index()
+        n_tokens = len(index.token_ids)
         results: list[str] = []
 
-        for idx, w in enumerate(words):
-            if w == target:
-                start = max(0, idx - context)
-                end = min(len(words), idx + context + 1)
-                window = words[start:end]
-                # Uppercase the target word for visibility
-                window[idx - start] = window[idx - start].upper()
-                snippet = " ".join(window)
-                if start > 0:
-                    snippet = "... " + snippet
-                if end < len(words):
-                    snippet = snippet + " ..."
-                results.append(snippet)
+        for idx in index.occurrences(word):
+            start = max(0, idx - context)
+            end = min(n_tokens, idx + context + 1)
+            window = index.decode(start, end)
+            # Uppercase the target word for visibility
+            window[idx - start] = window[idx - start].upper()
+            snippet = " ".join(window)
+            if start > 0:
+                snippet = "... " + snippet
+            if end < n_tokens:
+                snippet = snippet + " ..."
+            results.append(snippet)
 
         return results
 
+    # -- N-grams -------------------------------------------------------------
+
+    def _ngram_counter(self, n: int, approximate: bool = False) -> NgramCounter:
+        index = self._get_index()
+        counter = NgramCounter(n, approximate=approximate, vocab=index.words)
+        token_ids = index.token_ids
+        if isinstance(token_ids, memoryview):  # mapped from an index file
+            token_ids = array("I", token_ids.tobytes())
+        counter.update_ids(token_ids)
+        return counter
+
+    @timer
+    @cache_result(weak=True)
+    def ngrams(
+        self,
+        n: int = 2,
+        top_k: int = 10,
+        approximate: bool = False,
+    ) -> list[tuple[tuple[str, ...], int]]:
+        """Return the *top_k* most frequent word n-grams with their counts.
+
+        N-grams run over the whole token stream and keep stopwords.  With
+        ``approximate=True`` counts come from a count-min sketch.
+        """
+        return self._ngram_counter(n, approximate).most_common(top_k)
+
+    @timer
+    @cache_result(weak=True)
+    def collocations(
+        self,
+        top_k: int = 10,
+        measure: str = "llr",
+        min_count: int = 2,
+    ) -> list[tuple[tuple[str, str], float]]:
+        """Return the bigrams most strongly associated under *measure*."""
+        return self._ngram_counter(2).collocations(top_k, measure, min_count)
+
+    # -- Near duplicates -----------------------------------------------------
+
+    @cache_result(weak=True)
+    def minhash(
+        self,
+        num_perm: int = MINHASH_PERMUTATIONS,
+        shingle_size: int = SHINGLE_SIZE,
+    ) -> array:
+        """Return the MinHash signature of this text's word shingles.
+
+        Compare signatures with ``signature_similarity`` or index many of
+        them in an ``LSHIndex`` (see ``compute_signatures`` for corpora).
+        """
+        return minhash_signature(self._tokenize(), num_perm, shingle_size)
+
     # -- Report --------------------------------------------------------------
 
     def report(self) -> str:
@@ -346,18 +2963,417 @@ class TextAnalyzer:
 
         # Timing info
         sections.append(thin)
-        sections.append("TIMING")
+        sections.append("TIMING (all calls in this process)")
         sections.append(thin)
-        stats_time = getattr(self.stats, "last_elapsed", 0.0)
-        read_time = getattr(self.readability, "last_elapsed", 0.0)
-        sections.append(f"  stats()        {stats_time:.6f} s")
-        sections.append(f"  readability()  {read_time:.6f} s")
+        sections.extend(METRICS.format())
 
         sections.append(divider)
 
         return "\n".join(sections)
 
 
+# ---------------------------------------------------------------------------
+# Corpus analysis (map-reduce over files)
+# ---------------------------------------------------------------------------
+
+@dataclass
+class FileAnalysis:
+    """Per-file result of a corpus run."""
+    path: str
+    stats: TextStats | None = None
+    readability: ReadabilityScore | None = None
+    error: str | None = None
+
+
+@dataclass
+class CorpusResult:
+    """Per-file results plus corpus-level totals."""
+    files: list[FileAnalysis]
+    counts: TextCounts
+    stats: TextStats
+    readability: ReadabilityScore
+
+
+def merge_counts(parts: list[TextCounts], approximate: bool = False) -> TextCounts:
+    """Merge partial counts pairwise (tree reduction).
+
+    Each level halves the number of partials, so large frequency tables
+    are merged with similarly sized ones instead of being re-copied into
+    one ever-growing accumulator.  *approximate* only matters for an
+    empty list: it selects which kind of empty ``TextCounts`` to return.
+    """
+    if not parts:
+        return scan_chunks((), approximate=approximate)
+    while len(parts) > 1:
+        merged = [a.merge(b) for a, b in zip(parts[::2], parts[1::2])]
+        if len(parts) % 2:
+            merged.append(parts[-1])
+        parts = merged
+    return parts[0]
+
+
+def _analyze_batch_of_files(
+    paths: list[str],
+    stopwords: set[str],
+    top_n: int,
+    approximate: bool = False,
+) -> tuple[list[FileAnalysis], TextCounts]:
+    """Worker: scan *paths*, returning per-file results and their merge.
+
+    Merging inside the worker means only one frequency table per batch is
+    pickled back to the parent.
+    """
+    files: list[FileAnalysis] = []
+    parts: list[TextCounts] = []
+    for path in paths:
+        try:
+            counts = scan_file(path, approximate=approximate, stopwords=stopwords)
+        except (OSError, UnicodeDecodeError) as exc:
+            files.append(FileAnalysis(path, error=f"{type(exc).__name__}: {exc}"))
+            continue
+        files.append(FileAnalysis(
+            path,
+            stats=counts.to_stats(stopwords, top_n),
+            readability=counts.to_readability(),
+        ))
+        parts.append(counts)
+    return files, merge_counts(parts, approximate)
+
+
+class CorpusAnalyzer:
+    """Analyze many files in parallel and merge the results.
+
+    Files are split into batches that are fanned out over a process pool;
+    each worker returns per-file ``TextStats``/``ReadabilityScore`` and one
+    merged ``TextCounts`` for its batch, which are then tree-reduced into
+    the corpus totals.
+
+    Examples
+    --------
+    >>> result = CorpusAnalyzer(jobs=8).analyze_paths(["docs/"])  # doctest: +SKIP
+    >>> result.stats.word_count  # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        jobs: int | None = None,
+        stopwords: set[str] | None = None,
+        top_n: int = 10,
+        batch_size: int = 64,
+        approximate: bool = False,
+    ) -> None:
+        self.jobs = jobs if jobs is not None else (os.cpu_count() or 1)
+        self.approximate = approximate
+        self.stopwords = stopwords if stopwords is not None else DEFAULT_STOPWORDS
+        self.top_n = top_n
+        self.batch_size = batch_size
+
+    @staticmethod
+    def iter_files(paths, suffix: str = ".txt"):
+        """Yield files, expanding directories (recursively, files ending in
+        *suffix*) as they are reached (generator)."""
+        for path in paths:
+            if os.path.isdir(path):
+                for root, _dirs, names in os.walk(path):
+                    for name in sorted(names):
+                        if name.endswith(suffix):
+                            yield os.path.join(root, name)
+            else:
+                yield path
+
+    @staticmethod
+    def collect_files(paths: list[str], suffix: str = ".txt") -> list[str]:
+        """Expand directories (recursively, files ending in *suffix*)."""
+        return list(CorpusAnalyzer.iter_files(paths, suffix))
+
+    def analyze_paths(self, paths: list[str], suffix: str = ".txt") -> CorpusResult:
+        """Analyze files and directories given on e.g. a command line."""
+        return self.analyze(self.collect_files(paths, suffix))
+
+    def analyze(self, files: list[str]) -> CorpusResult:
+        """Analyze *files*, preserving their order in ``result.files``."""
+        batches = [
+            files[i:i + self.batch_size]
+            for i in range(0, len(files), self.batch_size)
+        ]
+        worker = partial(
+            _analyze_batch_of_files,
+            stopwords=self.stopwords,
+            top_n=self.top_n,
+            approximate=self.approximate,
+        )
+        if self.jobs <= 1 or len(batches) <= 1:
+            outputs = list(map(worker, batches))
+        else:
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                outputs = list(pool.map(worker, batches))
+
+        per_file = [fa for batch_files, _ in outputs for fa in batch_files]
+        counts = merge_counts([part for _, part in outputs], self.approximate)
+        return CorpusResult(
+            files=per_file,
+            counts=counts,
+            stats=counts.to_stats(self.stopwords, self.top_n),
+            readability=counts.to_readability(),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Ingestion pipeline (threads -> queue -> processes -> sink)
+# ---------------------------------------------------------------------------
+
+_DONE = object()  # end-of-stream marker passed down the pipeline queues
+
+
+def _read_file(path: str, encoding: str) -> str:
+    with open(path, encoding=encoding) as fh:
+        return fh.read()
+
+
+def _analyze_text(
+    path: str,
+    text: str,
+    stopwords: set[str],
+    top_n: int,
+    approximate: bool,
+) -> tuple[FileAnalysis, TextCounts]:
+    """Worker: analyze one file's text already read by the pipeline."""
+    counts = scan_text(text, approximate=approximate, stopwords=stopwords)
+    return (
+        FileAnalysis(
+            path,
+            stats=counts.to_stats(stopwords, top_n),
+            readability=counts.to_readability(),
+        ),
+        counts,
+    )
+
+
+class IngestionPipeline:
+    """Analyze a stream of files with overlapped I/O and CPU work.
+
+    Four asyncio stages joined by bounded queues::
+
+        paths -> [readers: thread pool] -> texts -> [workers: process pool]
+              -> results -> sink
+
+    *readers* threads open and read files while *jobs* processes tokenize
+    the texts read before them.  Every queue holds at most *queue_size*
+    items, so a slow stage blocks the ones upstream (backpressure): the
+    paths iterable is consumed only as fast as files are analyzed, and
+    memory stays flat however many files there are.
+
+    Results reach the sink in completion order.  With a *sink* callable
+    they are handed over one by one and not kept; otherwise they are
+    collected in ``CorpusResult.files``.  Corpus totals are folded in
+    place as results arrive.
+    """
+
+    def __init__(
+        self,
+        readers: int = 4,
+        jobs: int | None = None,
+        queue_size: int = 64,
+        stopwords: set[str] | None = None,
+        top_n: int = 10,
+        approximate: bool = False,
+        encoding: str = "utf-8",
+    ) -> None:
+        if readers < 1:
+            raise ValueError("readers must be at least 1")
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        self.readers = readers
+        self.jobs = jobs if jobs is not None else (os.cpu_count() or 1)
+        self.queue_size = queue_size
+        self.stopwords = stopwords if stopwords is not None else DEFAULT_STOPWORDS
+        self.top_n = top_n
+        self.approximate = approximate
+        self.encoding = encoding
+
+    def run(self, paths, sink=None) -> CorpusResult:
+        """Run the pipeline to completion (see ``arun``)."""
+        return asyncio.run(self.arun(paths, sink))
+
+    async def arun(self, paths, sink=None) -> CorpusResult:
+        """Analyze every file in the iterable *paths*."""
+        loop = asyncio.get_running_loop()
+        path_q: asyncio.Queue = asyncio.Queue(self.queue_size)
+        text_q: asyncio.Queue = asyncio.Queue(self.queue_size)
+        result_q: asyncio.Queue = asyncio.Queue(self.queue_size)
+        # Enough analysis tasks to keep every process busy while the
+        # next result is being handed back.
+        n_workers = max(1, self.jobs) * 2
+        worker = partial(
+            _analyze_text,
+            stopwords=self.stopwords,
+            top_n=self.top_n,
+            approximate=self.approximate,
+        )
+        files: list[FileAnalysis] = []
+        total = merge_counts([], self.approximate)
+
+        async def produce() -> None:
+            for path in paths:
+                await path_q.put(path)
+            for _ in range(self.readers):
+                await path_q.put(_DONE)
+
+        async def read() -> None:
+            while (path := await path_q.get()) is not _DONE:
+                try:
+                    text = await loop.run_in_executor(
+                        io_pool, _read_file, path, self.encoding
+                    )
+                except (OSError, UnicodeDecodeError) as exc:
+                    error = FileAnalysis(path, error=f"{type(exc).__name__}: {exc}")
+                    await result_q.put((error, None))
+                    continue
+                await text_q.put((path, text))
+
+        async def analyze() -> None:
+            while (item := await text_q.get()) is not _DONE:
+                await result_q.put(await loop.run_in_executor(cpu_pool, worker, *item))
+
+        async def stage(tasks, downstream: asyncio.Queue, n_done: int) -> None:
+            await asyncio.gather(*tasks)
+            for _ in range(n_done):
+                await downstream.put(_DONE)
+
+        async def consume() -> None:
+            while (item := await result_q.get()) is not _DONE:
+                analysis, counts = item
+                if counts is not None:
+                    total.update(counts)
+                if sink is not None:
+                    sink(analysis)
+                else:
+                    files.append(analysis)
+
+        cpu_pool = (
+            ProcessPoolExecutor(max_workers=self.jobs)
+            if self.jobs > 1 else ThreadPoolExecutor(max_workers=1)
+        )
+        with ThreadPoolExecutor(max_workers=self.readers) as io_pool, cpu_pool:
+            await asyncio.gather(
+                produce(),
+                stage([read() for _ in range(self.readers)], text_q, n_workers),
+                stage([analyze() for _ in range(n_workers)], result_q, 1),
+                consume(),
+            )
+        return CorpusResult(
+            files=files,
+            counts=total,
+            stats=total.to_stats(self.stopwords, self.top_n),
+            readability=total.to_readability(),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Batch analysis (many short documents)
+# ---------------------------------------------------------------------------
+
+BATCH_CHUNK_SIZE = 10_000
+
+
+@dataclass
+class BatchResult:
+    """Columnar results of ``analyze_batch``: one array per metric.
+
+    Row ``i`` of every column describes ``texts[i]`` and matches what
+    ``TextAnalyzer(texts[i]).stats()`` / ``.readability()`` report.
+    """
+    word_count: array = field(default_factory=lambda: array("I"))
+    sentence_count: array = field(default_factory=lambda: array("I"))
+    char_count: array = field(default_factory=lambda: array("I"))
+    unique_words: array = field(default_factory=lambda: array("I"))
+    avg_word_length: array = field(default_factory=lambda: array("d"))
+    flesch_kincaid_grade: array = field(default_factory=lambda: array("d"))
+    avg_sentence_length: array = field(default_factory=lambda: array("d"))
+    avg_syllables_per_word: array = field(default_factory=lambda: array("d"))
+
+    def __len__(self) -> int:
+        return len(self.word_count)
+
+    def columns(self) -> dict[str, array]:
+        return dict(vars(self))
+
+    def row(self, i: int) -> dict[str, float]:
+        return {name: column[i] for name, column in vars(self).items()}
+
+    def extend(self, other: "BatchResult") -> None:
+        for name, column in vars(self).items():
+            column.extend(getattr(other, name))
+
+
+def _analyze_text_chunk(texts: list[str]) -> BatchResult:
+    """Worker: analyze *texts* in one loop, with no per-text objects."""
+    result = BatchResult()
+    add_words = result.word_count.append
+    add_sentences = result.sentence_count.append
+    add_chars = result.char_count.append
+    add_unique = result.unique_words.append
+    add_avg_len = result.avg_word_length.append
+    add_grade = result.flesch_kincaid_grade.append
+    add_asl = result.avg_sentence_length.append
+    add_asw = result.avg_syllables_per_word.append
+    findall = _WORD_RE.findall
+    find_breaks = _SENTENCE_BREAK_RE.findall
+    for text in texts:
+        if text.isascii():
+            words = findall(text.lower())
+        else:
+            words = [w.lower() for w in findall(text)]
+        n = len(words)
+        chars = sum(map(len, text.split()))
+        sentences = len(find_breaks(text)) + (1 if chars else 0)
+        grade, asl, asw = _flesch_kincaid(
+            n, sentences, sum(map(count_syllables, words))
+        )
+        add_words(n)
+        add_sentences(sentences)
+        add_chars(chars)
+        add_unique(len(set(words)))
+        add_avg_len(round(sum(map(len, words)) / n, 2) if n else 0.0)
+        add_grade(grade)
+        add_asl(asl)
+        add_asw(asw)
+    return result
+
+
+def analyze_batch(
+    texts,
+    jobs: int = 1,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> BatchResult:
+    """Analyze many short texts, returning columnar results.
+
+    Skips the per-document ``TextAnalyzer`` (fingerprint, cache lookup,
+    result dataclasses): each text is handled in one tight loop and its
+    metrics appended to typed arrays.  *texts* may be any iterable; it is
+    cut into chunks of *chunk_size*, spread over *jobs* processes when
+    ``jobs > 1``.  Top words are not computed; use ``TextAnalyzer`` or
+    ``CorpusAnalyzer`` for those.
+
+    Examples
+    --------
+    >>> batch = analyze_batch(["Hi there.", "One. Two."])
+    >>> list(batch.sentence_count)
+    [1, 2]
+    """
+    it = iter(texts)
+    chunks = iter(lambda: list(islice(it, chunk_size)), [])
+    result = BatchResult()
+    if jobs <= 1:
+        for chunk in chunks:
+            result.extend(_analyze_text_chunk(chunk))
+        return result
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for part in pool.map(_analyze_text_chunk, chunks):
+            result.extend(part)
+    return result
+
+
 # ---------------------------------------------------------------------------
 # Tests
 # ---------------------------------------------------------------------------
@@ -419,6 +3435,14 @@ def run_tests() -> None:
     assert count_syllables("beautiful") == 3, f"beautiful -> {count_syllables('beautiful')}"
     assert count_syllables("a") == 1, f"a -> {count_syllables('a')}"
     assert count_syllables("the") == 1, f"the -> {count_syllables('the')}"
+    words_counter = Counter(w.lower() for w in re.findall(r"[a-zA-Z']+", sample))
+    assert count_syllables_batch(words_counter) == sum(
+        count_syllables(w.lower()) for w in re.findall(r"[a-zA-Z']+", sample)
+    )
+    hits_before = count_syllables.cache_info().hits
+    TextAnalyzer(sample).readability()
+    assert count_syllables.cache_info().hits > hits_before, "shared cache"
+    assert count_syllables.cache_info().maxsize == SYLLABLE_CACHE_SIZE
 
     # -- empty text ----------------------------------------------------------
     empty = TextAnalyzer("")
@@ -426,6 +3450,624 @@ def run_tests() -> None:
     assert es.word_count == 0
     assert es.sentence_count == 0
 
+    # -- fused scan matches a naive per-metric computation -------------------
+    tricky = (
+        "Dr. Smith's cat!  It ran.\nAway...   fast?Yes.\n\n  "
+        "Caf\u00e9 na\u00efve \u212aelvin's ideas.   "
+    )
+    naive_words = [w.lower() for w in re.findall(r"[a-zA-Z']+", tricky)]
+    naive_sentences = [
+        p for p in re.split(r"(?<=[.!?])\s+", tricky.strip()) if p.strip()
+    ]
+    for block_size in (1, 3, 7, 64, SCAN_BLOCK_SIZE):
+        tc = scan_text(tricky, block_size=block_size)
+        assert tc.word_count == len(naive_words), block_size
+        assert tc.freq == Counter(naive_words), block_size
+        assert tc.sentence_count == len(naive_sentences), block_size
+        assert tc.char_count == sum(1 for ch in tricky if not ch.isspace())
+        assert tc.letter_count == sum(len(w) for w in naive_words)
+        assert tc.syllable_count == sum(count_syllables(w) for w in naive_words)
+    assert scan_text("   \n ").sentence_count == 0
+
+    # -- streaming sentence spans --------------------------------------------
+    for block_size in (1, 2, 3, 7, 64):
+        chunks = (
+            tricky[i:i + block_size] for i in range(0, len(tricky), block_size)
+        )
+        spans = list(iter_sentence_spans(chunks))
+        assert [tricky[s:e] for s, e in spans] == [
+            p.strip() for p in naive_sentences
+        ], block_size
+    assert list(iter_sentence_spans(["", "  ", "\n"])) == []
+    assert list(iter_sentence_spans(["Hi.", "   ", "  ", "Yo!"])) == [
+        (0, 3), (8, 11)
+    ]
+    assert list(TextAnalyzer(tricky)._sentences()) == [
+        p.strip() for p in naive_sentences
+    ]
+    chunked = TextAnalyzer("One. Two")
+    chunked.append(" three.  Four?")
+    assert [chunked.text[s:e] for s, e in chunked.sentence_spans()] == [
+        "One.", "Two three.", "Four?"
+    ]
+
+    # -- streaming file scan -------------------------------------------------
+    import os
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "doc.txt")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(tricky * 50)
+        expected = scan_text(tricky * 50)
+        for chunk_size in (1, 5, 1000):
+            assert scan_file(path, chunk_size=chunk_size) == expected
+            assert scan_file(path, chunk_size, use_mmap=True) == expected
+        empty = os.path.join(tmp, "empty.dat")
+        open(empty, "w").close()
+        assert scan_file(empty, use_mmap=True) == scan_text("")
+        streamed = scan_file(path)
+        whole = TextAnalyzer.from_file(path)
+        assert streamed.to_stats(DEFAULT_STOPWORDS) == whole.stats()
+        assert streamed.to_readability() == whole.readability()
+
+        # -- corpus analysis -------------------------------------------------
+        docs = [sample, tricky, "", "One more. Tiny doc!"]
+        paths = []
+        for i, doc in enumerate(docs):
+            paths.append(os.path.join(tmp, f"corpus{i}.txt"))
+            with open(paths[-1], "w", encoding="utf-8") as fh:
+                fh.write(doc)
+        serial = CorpusAnalyzer(jobs=1, batch_size=1).analyze_paths([tmp])
+        assert len(serial.files) == len(docs) + 1  # doc.txt from above too
+        serial = CorpusAnalyzer(jobs=1, batch_size=1).analyze(sorted(paths))
+        parallel = CorpusAnalyzer(jobs=2, batch_size=2).analyze(sorted(paths))
+        assert [fa.path for fa in parallel.files] == sorted(paths)
+        assert parallel.counts == serial.counts
+        expected = merge_counts([scan_text(d) for d in docs])
+        assert parallel.counts == expected
+        assert parallel.stats.word_count == sum(scan_text(d).word_count for d in docs)
+        assert parallel.files[0].stats == TextAnalyzer(sample).stats()
+        broken = CorpusAnalyzer(jobs=1).analyze([os.path.join(tmp, "missing.txt")])
+        assert broken.files[0].error and broken.stats.word_count == 0
+
+        # -- ingestion pipeline -----------------------------------------------
+        bad = os.path.join(tmp, "latin1.txt")
+        with open(bad, "wb") as fh:
+            fh.write("caf\xe9".encode("latin-1"))
+        for jobs in (1, 2):
+            piped = IngestionPipeline(readers=2, jobs=jobs, queue_size=2).run(
+                paths + [bad, os.path.join(tmp, "missing.txt")]
+            )
+            assert len(piped.files) == len(paths) + 2
+            assert piped.counts == expected
+            ok = {fa.path: fa for fa in piped.files if not fa.error}
+            assert ok[paths[0]].stats == TextAnalyzer(sample).stats()
+            assert {fa.path for fa in piped.files if fa.error} == {
+                bad, os.path.join(tmp, "missing.txt")
+            }
+        # Backpressure: paths are pulled only as fast as results drain.
+        pulled = []
+
+        def lazy_paths():
+            for i in range(200):
+                pulled.append(i)
+                yield paths[i % len(paths)]
+
+        seen_at_first_result = []
+        received = []
+
+        def sink(analysis):
+            if not received:
+                seen_at_first_result.append(len(pulled))
+            received.append(analysis)
+
+        pipeline = IngestionPipeline(readers=2, jobs=2, queue_size=2)
+        streamed = pipeline.run(lazy_paths(), sink=sink)
+        assert len(received) == 200 and streamed.files == []
+        # queues (3 x 2) + readers (2) + analysis tasks (4) + producer (1)
+        assert seen_at_first_result[0] <= 13, seen_at_first_result
+        assert streamed.counts.word_count == 50 * expected.word_count
+        for bad in ({"readers": 0}, {"queue_size": 0}):
+            try:
+                IngestionPipeline(**bad)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"expected ValueError for {bad}")
+
+    # Unbroken runs longer than max_carry are cut between words.
+    blob = "ab,cd." * 10
+    scanner = _TextScanner(max_carry=8)
+    for piece in (blob, blob + "x. ", "Y z"):
+        scanner.feed(piece)
+    assert len(scanner._carry) < 16, "carry must stay bounded"
+    assert scanner.finish() == scan_text(blob + blob + "x. Y z")
+    assert analyzer.counts() is analyzer.counts(), "scan should run once"
+
+    # -- positional index agrees with a full scan ----------------------------
+    lines_text = (
+        "Foxes and a fox.\r\nno match here\x0cThe FOX's den\u2028"
+        "\u212aelvin ks\n\nfoxfox at the end"
+    )
+    idx_analyzer = TextAnalyzer(lines_text)
+    for pat in ("fox", "FOX", "ks", "x's", "zzz", "o", r"f.x", "den$", ""):
+        naive = [
+            (i, line)
+            for i, line in enumerate(lines_text.splitlines(), start=1)
+            if re.search(pat, line, re.IGNORECASE)
+        ]
+        assert idx_analyzer.search(pat) == naive, pat
+    naive_tokens = list(idx_analyzer._tokenize())
+    token_store = idx_analyzer._get_index()
+    assert token_store.decode(0, len(token_store.token_ids)) == naive_tokens
+    assert token_store.words == list(dict.fromkeys(naive_tokens))
+    assert token_store.token_ids.itemsize == 4
+    for w in ("fox", "foxes", "the", "missing"):
+        expected_count = naive_tokens.count(w)
+        assert len(idx_analyzer.concordance(w, context=2)) == expected_count
+    assert idx_analyzer.concordance("fox", context=1) == ["... a FOX no ..."]
+    assert idx_analyzer._get_index() is idx_analyzer._get_index()
+
+    # -- multi-pattern search ------------------------------------------------
+    watch = [
+        "fox", "FOX", "ks", "x's", "zzz", "o", "the end", "fox fox",
+        r"f.x", "den$", r"(o)\1", "(?i)here", "",
+    ]
+    many = idx_analyzer.search_many(w for w in watch)
+    for pat in watch:
+        assert many[pat] == idx_analyzer.search(pat), pat
+    assert idx_analyzer.search_many(reversed(watch)) == many
+    assert _get_search_plan(frozenset(watch)) is _get_search_plan(
+        frozenset(reversed(watch))
+    ), "plans should be cached per pattern set"
+    ac = AhoCorasick(["he", "she", "his", "hers"])
+    found = sorted((end, ac.terms[t]) for end, t in ac.finditer("ushers"))
+    assert found == [(4, "he"), (4, "she"), (6, "hers")], found
+
+    # -- result cache --------------------------------------------------------
+    import gc
+
+    keyed = TextAnalyzer(sample)
+    ten = keyed.stats(top_n=10)
+    assert keyed.stats() is ten, "defaults must map to the same entry"
+    three = keyed.stats(top_n=3)
+    assert len(three.top_words) == 3, "top_n must be part of the cache key"
+    assert keyed.stats(10) is ten
+    before = RESULT_CACHE.stats()
+    keyed.stats(top_n=3)
+    after = RESULT_CACHE.stats()
+    assert after.hits == before.hits + 1 and after.misses == before.misses
+    entries = len(RESULT_CACHE)
+    del keyed, ten, three
+    gc.collect()
+    assert len(RESULT_CACHE) == entries - 2, "weak entries die with the analyzer"
+
+    budget = ResultCache(max_bytes=2000)
+
+    class _Doc:
+        def __init__(self, text):
+            self._text_hash = text
+
+        @cache_result(cache=budget)
+        def echo(self, n=1):
+            return ["x" * 100] * n
+
+        @cache_result(cache=budget)
+        def size_of(self, items):
+            return len(items)
+
+    shared_a, shared_b = _Doc("same"), _Doc("same")
+    assert shared_a.echo() is shared_b.echo(), "non-weak entries are shared"
+    for n in range(2, 30):
+        shared_a.echo(n)
+    assert budget.stats().bytes <= 2000 and budget.stats().evictions > 0
+    assert shared_a.size_of([1, 2]) == 2, "unhashable arguments skip the cache"
+
+    # -- lazy fingerprint ----------------------------------------------------
+    lazy = TextAnalyzer(sample)
+    assert lazy._fingerprint is None, "no hashing at construction"
+    lazy.counts()
+    lazy.search("fox")
+    assert lazy._fingerprint is None, "uncached methods never hash the text"
+    lazy.stats()
+    assert lazy._fingerprint is not None
+    assert lazy._text_hash == TextAnalyzer(sample)._text_hash
+    assert lazy._text_hash != TextAnalyzer(sample, stopwords={"fox"})._text_hash
+    assert lazy._text_hash[1] == _stopwords_digest(set(DEFAULT_STOPWORDS))
+    DEFAULT_STOPWORDS.add("fox")  # callers may still tune the shared set
+    try:
+        assert TextAnalyzer(sample)._text_hash != lazy._text_hash
+    finally:
+        DEFAULT_STOPWORDS.discard("fox")
+
+    # -- approximate stats (Misra-Gries + HyperLogLog) ------------------------
+    exact = scan_text(tricky)
+    approx = scan_text(tricky, block_size=7, approximate=True)
+    assert approx.approximate and not exact.approximate
+    assert approx.word_count == exact.word_count
+    assert approx.sentence_count == exact.sentence_count
+    assert approx.syllable_count == exact.syllable_count
+    assert approx.letter_count == exact.letter_count
+    a_stats = approx.to_stats(DEFAULT_STOPWORDS)
+    assert a_stats.approximate and "+/-" in str(a_stats)
+    assert a_stats.top_words == exact.to_stats(DEFAULT_STOPWORDS).top_words
+    assert a_stats.unique_words == len(exact.freq)  # small: linear counting
+    assert analyzer.stats(approximate=True).top_words == analyzer.stats().top_words
+
+    # Misra-Gries: every count is low by at most error <= total/(capacity+1)
+    zipf = Counter({f"w{i}": 10_000 // i for i in range(1, 2001)})
+    mg = MisraGries(capacity=50)
+    for word, c in zipf.items():
+        mg.update({word: c})
+    assert mg.total == zipf.total()
+    assert mg.error <= mg.total // 51
+    for word, c in zipf.items():
+        assert c - mg.error <= mg.counts.get(word, 0) <= c
+    halves = MisraGries(capacity=50), MisraGries(capacity=50)
+    for i, (word, c) in enumerate(zipf.items()):
+        halves[i % 2].update({word: c})
+    merged = halves[0].merge(halves[1])
+    assert merged.error <= merged.total // 51
+    assert [w for w, _ in merged.most_common(5)] == [f"w{i}" for i in range(1, 6)]
+
+    # HyperLogLog: within a few standard errors, mergeable, process-stable
+    hll_a, hll_b = HyperLogLog(12), HyperLogLog(12)
+    hll_a.update(f"a{i}" for i in range(30_000))
+    hll_b.update(f"a{i}" for i in range(20_000, 50_000))
+    assert abs(hll_a.estimate() - 30_000) < 30_000 * 4 * hll_a.relative_error
+    union = hll_a.merge(hll_b)
+    assert abs(union.estimate() - 50_000) < 50_000 * 4 * union.relative_error
+    assert _hash64("fox") == _hash64("fox") != _hash64("dog")
+    try:
+        hll_a.merge(HyperLogLog(10))
+        assert False, "precision mismatch should raise"
+    except ValueError:
+        pass
+    try:
+        exact.merge(approx)
+        assert False, "exact/approximate merge should raise"
+    except ValueError:
+        pass
+
+    # -- batch analysis -----------------------------------------------------
+    docs = [sample, tricky, "", "   ", "One.", "Wait... what?! Yes.", "naïve café"]
+    docs += [tricky[i:i + 37] for i in range(0, len(tricky), 37)]
+    batch = analyze_batch(docs, chunk_size=4)
+    assert len(batch) == len(docs)
+    for i, doc in enumerate(docs):
+        s_doc, r_doc = TextAnalyzer(doc).stats(), TextAnalyzer(doc).readability()
+        row = batch.row(i)
+        for name in ("word_count", "sentence_count", "char_count",
+                     "unique_words", "avg_word_length"):
+            assert row[name] == getattr(s_doc, name), (doc, name)
+        for name in ("flesch_kincaid_grade", "avg_sentence_length",
+                     "avg_syllables_per_word"):
+            assert row[name] == getattr(r_doc, name), (doc, name)
+    pooled = analyze_batch(iter(docs), jobs=2, chunk_size=5)
+    assert pooled.columns() == batch.columns()
+    assert len(analyze_batch([])) == 0
+
+    # -- bytes fast path ------------------------------------------------------
+    rng = random.Random(7)
+    fuzz = [tricky, "end.  Next", "a. b", "abc,def;ghi" * 30 + ". Ok", "", "  ",
+            "\x1c.\x1fA", "x.\u00a0Y", generate_corpus(3000, seed=2)]
+    fuzz += [
+        "".join(rng.choice("ab .!?\n\t\x1c'\u00e9\u00a0,A") for _ in range(40))
+        for _ in range(200)
+    ]
+    for doc in fuzz:
+        expected = scan_text(doc)
+        for block_size in (1, 2, 5, 64, SCAN_BLOCK_SIZE):
+            got = scan_bytes(doc.encode(), block_size=block_size)
+            assert got == expected, (doc, block_size)
+    assert scan_bytes(bytearray(b"Hi. Yo"), approximate=True).to_stats(
+        DEFAULT_STOPWORDS
+    ) == scan_text("Hi. Yo", approximate=True).to_stats(DEFAULT_STOPWORDS)
+    assert bytes(range(65, 91)).translate(_BYTES_WORD_TABLE) == b"abcdefghijklmnopqrstuvwxyz"
+    try:
+        scan_bytes(b"ok \xff\xfe")
+        assert False, "invalid UTF-8 should raise"
+    except UnicodeDecodeError:
+        pass
+    latin = "Caf\u00e9 cr\u00e8me. Na\u00efve!"
+    assert scan_bytes(latin.encode("cp1252"), 3, "cp1252") == scan_text(latin)
+    for encoding in ("utf-16", "shift_jis", "iso2022_jp", "no-such-codec"):
+        try:
+            scan_bytes(latin.encode("utf-16"), encoding=encoding)
+            assert False, f"{encoding} should be rejected"
+        except ValueError:
+            pass
+
+    # -- incremental append ---------------------------------------------------
+    for cuts in ((5, 17, 44), (1, 2, 3), (len(tricky) // 2,), (43, 44, 45)):
+        grown = TextAnalyzer(tricky[:cuts[0]])
+        grown.stats()  # counts, fingerprint and cache entry exist before appending
+        for a, b in zip(cuts, cuts[1:] + (len(tricky),)):
+            grown.append(tricky[a:b])
+            grown.counts()  # snapshot mid-word / mid-sentence, then go on
+        fresh = TextAnalyzer(tricky)
+        assert grown.counts() == scan_text(tricky)
+        assert grown.stats() == fresh.stats()
+        assert grown.readability() == fresh.readability()
+        assert grown._text_hash == fresh._text_hash
+        assert grown.text == tricky
+    chat = TextAnalyzer("Hello wor")
+    assert chat.stats().word_count == 2
+    chat.append("ld. How are")
+    assert chat.concordance("world") == ["hello WORLD how are"]
+    chat.append(" you?  Fine.")
+    assert (chat.stats().word_count, chat.stats().sentence_count) == (6, 3)
+    assert chat.search("Fine") == [(1, "Hello world. How are you?  Fine.")]
+    assert "wor" not in chat.counts().freq
+    chat.text = "Reset."
+    assert chat.stats().word_count == 1
+    # The positional index grows with the text: lines split mid-word and
+    # "\r" + "\n" across appends index the same as the joined text.
+    pieces = ["Alpha be", "ta\r", "\nGam", "ma \u212a", "elvin.\n", "\r", "Omega", ""]
+    grown = TextAnalyzer(pieces[0])
+    index = grown._get_index()
+    for piece in pieces[1:]:
+        grown.append(piece)
+        assert grown._get_index() is index
+        fresh = _PositionalIndex(grown.text)
+        assert index.line_starts == fresh.line_starts
+        assert index.line_ends == fresh.line_ends
+        assert index.token_lines == fresh.token_lines
+        assert index.special_lines == fresh.special_lines
+        ntokens = len(fresh.token_ids)
+        assert index.decode(0, len(index.token_ids)) == fresh.decode(0, ntokens)
+        for word in index.vocab:
+            assert index.occurrences(word) == fresh.occurrences(word), word
+    assert grown.search("kelvin") == [(2, "Gamma \u212aelvin.")]
+    assert grown.concordance("beta", context=1) == ["alpha BETA gamma ..."]
+
+    # -- n-grams and collocations -------------------------------------------
+    words = "new york is big . i love new york . new york new york".split()
+    bigrams = NgramCounter(2)
+    for part in (words[:5], words[5:6], words[6:]):  # n-grams span updates
+        bigrams.update(part)
+    assert bigrams.total == len(words) - 1
+    assert bigrams.most_common(1) == [(("new", "york"), 4)]
+    assert bigrams.count(("york", "new")) == 1
+    assert bigrams.count(("no", "such")) == 0
+    assert "such" not in bigrams.vocab
+    expected = Counter(zip(words, words[1:]))
+    assert dict(bigrams.most_common()) == dict(expected)
+    trigrams = NgramCounter(3)
+    trigrams.update(words)
+    assert dict(trigrams.most_common()) == dict(
+        Counter(zip(words, words[1:], words[2:]))
+    )
+    colloc = bigrams.collocations(top_k=1, measure="pmi")
+    assert colloc[0][0] == ("new", "york")
+    llr = dict(bigrams.collocations(top_k=20, measure="llr", min_count=1))
+    assert llr[("new", "york")] > llr[("york", "is")] > 0
+    try:
+        bigrams.collocations(measure="dice")
+        assert False, "unknown measure should raise"
+    except ValueError:
+        pass
+    left, right = NgramCounter(2), NgramCounter(2)
+    left.update(words[:6])
+    right.update(words[6:])
+    both = left.merge(right)
+    assert both.total == left.total + right.total
+    assert both.count(("new", "york")) == 4
+
+    sketched = NgramCounter(2, approximate=True, width=256, candidates=8)
+    repeated = words * 50
+    sketched.update(repeated)
+    assert sketched.most_common(1)[0][0] == ("new", "york")
+    for bigram, true_count in Counter(zip(repeated, repeated[1:])).items():
+        assert true_count <= sketched.count(bigram) <= true_count + sketched.error
+    cms_a, cms_b = CountMinSketch(64, 2), CountMinSketch(64, 2)
+    cms_a.add(7, 3)
+    cms_b.add(7, 4)
+    assert cms_a.merge(cms_b).estimate(7) >= 7
+
+    assert analyzer.ngrams(1, top_k=1) == [(("the",), 4)]
+    city = TextAnalyzer("New York is big.\nI love New York. New York, New York!")
+    assert city.ngrams(2, top_k=1) == [(("new", "york"), 4)]
+    assert city.ngrams(2, top_k=1, approximate=True) == [(("new", "york"), 4)]
+    assert city.collocations(top_k=1)[0][0] == ("new", "york")
+    unigrams = NgramCounter(1, approximate=True)
+    unigrams.update(["a", "b", "a"])
+    assert unigrams.most_common(1) == [(("a",), 2)] and unigrams.total == 3
+    assert TextAnalyzer("a b c a").ngrams(1, top_k=1, approximate=True) == [(("a",), 2)]
+
+    # -- near-duplicate detection -------------------------------------------
+    rng = random.Random(5)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    lexicon = ["".join(rng.choice(letters) for _ in range(6)) for _ in range(2000)]
+    originals = [" ".join(rng.choice(lexicon) for _ in range(120)) for _ in range(40)]
+    docs = list(originals)
+    for i in range(0, 40, 8):  # one-word edits of every eighth document
+        words = originals[i].split()
+        words[rng.randrange(len(words))] = "edited"
+        docs.append(" ".join(words))
+    sigs = compute_signatures(docs, chunk_size=7)
+    assert len(sigs) == len(docs)
+    assert sigs[0] == TextAnalyzer(docs[0]).minhash()
+    assert compute_signatures(docs, jobs=2, chunk_size=9) == sigs
+    assert signature_similarity(sigs[0], sigs[0]) == 1.0
+    assert signature_similarity(sigs[0], sigs[40]) > 0.8
+    assert signature_similarity(sigs[0], sigs[1]) < 0.2
+    lsh = LSHIndex.from_signatures(sigs)
+    assert lsh.clusters() == [[i, 40 + i // 8] for i in range(0, 40, 8)]
+    assert [d for d, _ in lsh.query(sigs[40])] == [40, 0]  # best first
+    assert 0.6 < lsh.threshold < 0.8
+    assert near_duplicates(["a b c d", "x y z", "a b c d"]) == [[0, 2]]
+    assert near_duplicates([]) == []
+    assert minhash_signature([]) == minhash_signature([])
+    assert len(minhash_signature(["one"], num_perm=8)) == 8
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sigs.bin")
+        sigs.save(path)
+        assert MinHashSignatures.load(path) == sigs
+    try:
+        LSHIndex(num_perm=128, bands=10)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("bands must divide num_perm")
+
+    # -- BM25 ranked retrieval ------------------------------------------------
+    lines = generate_corpus(60_000, "short-lines", seed=8).splitlines()
+    bm25 = BM25Index.from_texts(lines)
+    assert len(bm25) == len(lines)
+    vocab_by_df = sorted(bm25.postings, key=lambda t: (-len(bm25.postings[t].docs), t))
+    rng = random.Random(9)
+    for _ in range(40):
+        query = " ".join(
+            rng.choice(vocab_by_df[:20] if rng.random() < 0.5 else vocab_by_df)
+            for _ in range(rng.randint(1, 4))
+        )
+        k = rng.choice((1, 5, 20))
+        scored = sorted(
+            ((bm25.score(query, d), d) for d in range(len(bm25))),
+            key=lambda h: (-h[0], h[1]),
+        )
+        expected = [d for s_d, d in scored[:k] if s_d > 0]
+        hits = bm25.search(query, k)
+        assert [d for d, _ in hits] == expected, query
+        assert all(abs(s_d - bm25.score(query, d)) < 1e-9 for d, s_d in hits)
+    small = BM25Index.from_texts(["the cat sat", "cat cat cat", "a dog barked"])
+    assert [d for d, _ in small.search("cat")] == [1, 0]
+    assert small.search("the a") == []  # stopwords only
+    assert small.search("unicorn") == [] and small.search("cat", k=0) == []
+    assert BM25Index().search("cat") == []
+    assert small.idf("cat") < small.idf("dog")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, body in (("a.txt", "red fox"), ("b.txt", "blue fox fox")):
+            with open(os.path.join(tmp, name), "w", encoding="utf-8") as fh:
+                fh.write(body)
+        with open(os.path.join(tmp, "c.txt"), "wb") as fh:
+            fh.write(b"fox \xff\xfe")
+        by_path = BM25Index.from_paths([tmp])
+        assert [os.path.basename(p) for p, _ in by_path.search("fox")] == ["b.txt", "a.txt"]
+        assert list(map(os.path.basename, by_path.errors)) == ["c.txt"]
+        assert "UnicodeDecodeError" in next(iter(by_path.errors.values()))
+
+    # -- on-disk index -------------------------------------------------------
+    with tempfile.TemporaryDirectory() as tmp:
+        for doc in (sample + tricky + "K\u0131te \u212aelvin.\r\n", "", "one"):
+            original = TextAnalyzer(doc)
+            path = os.path.join(tmp, "doc.idx")
+            original.save(path)
+            RESULT_CACHE.clear()
+            opened = TextAnalyzer.open(path)
+            assert opened.stats() == original.stats()
+            assert opened.stats(top_n=2) == original.stats(top_n=2)
+            assert opened.readability() == original.readability()
+            assert list(opened.sentence_spans()) == list(original.sentence_spans())
+            for word in ["fox", "kite", "k", "elvin", "naive", "missing"] + doc.split()[:20]:
+                assert opened.concordance(word, 2) == original.concordance(word, 2)
+                assert opened.search(word) == original.search(word), word
+            for pattern in (r"\bfo\w", "it ran", "[.!?]$"):
+                assert opened.search(pattern) == original.search(pattern)
+            assert opened._pieces is None  # all served from the mapped file
+            assert opened.ngrams(2) == original.ngrams(2)
+            assert opened.counts() == original.counts()
+            assert opened.text == doc
+            opened.append(" Appended words.")
+            original.append(" Appended words.")
+            assert opened.stats() == original.stats()
+            assert opened.concordance("appended") == original.concordance("appended")
+        # Rebuilding an index that is being served must not disturb readers.
+        path = os.path.join(tmp, "live.idx")
+        TextAnalyzer("hello world.\nhello again.").save(path)
+        live = TextAnalyzer.open(path)
+        TextAnalyzer("x").save(path)
+        assert live.search("hello") == [(1, "hello world."), (2, "hello again.")]
+        assert TextAnalyzer.open(path).stats().word_count == 1
+        assert sorted(os.listdir(tmp)) == ["doc.idx", "live.idx"]
+        live.close()
+        assert live._mapped._mm.closed
+        with TextAnalyzer.open(path) as closing:
+            assert closing.search("x") == [(1, "x")]
+        assert closing._mapped._mm.closed
+        try:
+            closing.concordance("x")
+            raise AssertionError("expected ValueError")
+        except ValueError:
+            pass
+        with _MappedIndex(path) as mapped:
+            assert list(mapped.occurrences("x")) == [0]
+        assert mapped._mm.closed
+        detached = TextAnalyzer.open(path)
+        mapped = detached._mapped
+        detached.append(" y")
+        assert mapped._mm.closed and detached.search("x y") == [(1, "x y")]
+        bogus = os.path.join(tmp, "bogus.idx")
+        with open(bogus, "wb") as fh:
+            fh.write(b"not an index")
+        try:
+            TextAnalyzer.open(bogus)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError for a non-index file")
+
+    # -- benchmark corpora and harness ---------------------------------------
+    corpus = generate_corpus(20_000, seed=3)
+    assert len(corpus) == 20_000 and corpus == generate_corpus(20_000, seed=3)
+    assert corpus != generate_corpus(20_000, seed=4)
+    blocks = list(iter_corpus(200_000, seed=3, vocab_size=500))
+    assert "".join(blocks) == generate_corpus(200_000, seed=3, vocab_size=500)
+    assert len(blocks) > 1 and sum(map(len, blocks)) == 200_000
+    assert "\n" not in generate_corpus(20_000, "long-lines")
+    short_lines = generate_corpus(20_000, "short-lines").splitlines()
+    assert max(len(line.split()) for line in short_lines) <= 6
+    top_word, top_count = scan_text(corpus).freq.most_common(1)[0]
+    assert top_count > scan_text(corpus).word_count / 20  # Zipf head
+    bench = benchmark(sizes=(20_000,), layouts=("short-lines",), ops=("stats", "search"))
+    assert [r["op"] for r in bench["results"]] == ["stats", "search"]
+    assert all(r["peak_bytes"] > 0 and r["size"] == 20_000 for r in bench["results"])
+    json.loads(json.dumps(bench))
+
+    # -- metrics registry ------------------------------------------------------
+    registry = MetricsRegistry()
+    for ns in range(1, 1001):
+        registry.record("op", ns * 1000)  # 1us .. 1ms, uniform
+    m = registry.snapshot()["op"]
+    assert m.calls == 1000 and m.max == 1e-3
+    for value, expected in ((m.p50, 500e-6), (m.p95, 950e-6), (m.p99, 990e-6)):
+        assert abs(value - expected) <= expected * 0.02, (value, expected)
+    assert json.loads(registry.to_json())["op"]["calls"] == 1000
+
+    @timer(registry=registry)
+    def flaky(fail):
+        if fail:
+            raise ValueError
+        return "ok"
+
+    def hammer():
+        for _ in range(500):
+            flaky(False)
+    threads = [threading.Thread(target=hammer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    try:
+        flaky(True)
+    except ValueError:
+        pass
+    assert registry.snapshot()[flaky.__qualname__].calls == 4 * 500 + 1
+
+    METRICS.reset()
+    timed = TextAnalyzer(sample)
+    timed.stats()
+    timed.stats()
+    timed.concordance("fox")
+    calls = {name: m.calls for name, m in METRICS.snapshot().items()}
+    assert calls["TextAnalyzer.stats"] == 2
+    assert calls["TextAnalyzer.concordance"] == 1
+    timing = timed.report().split("TIMING")[1]
+    assert "TextAnalyzer.readability" in timing and "p95" in timing
+    assert METRICS.snapshot()["TextAnalyzer.stats"].calls == 3
+
     # -- custom stopwords ----------------------------------------------------
     custom = TextAnalyzer(sample, stopwords=set())
     cs = custom.stats()
@@ -470,6 +4112,152 @@ programming languages in the world."""
         print(f"  {snippet}")
 
 
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+BENCH_LAYOUTS = ("paragraphs", "long-lines", "short-lines")
+BENCH_OPS = ("stats", "readability", "search", "concordance", "report")
+_BENCH_SYLLABLES = [c + v for c in "bcdfghklmnprstvwz" for v in "aeiou"]
+
+
+def _bench_vocabulary(size: int, rng: random.Random) -> list[str]:
+    """Return *size* distinct pronounceable words of 1-4 syllables."""
+    words: dict[str, None] = {}
+    while len(words) < size:
+        k = rng.choice((1, 2, 2, 2, 3, 3, 4))
+        words["".join(rng.choices(_BENCH_SYLLABLES, k=k))] = None
+    return list(words)
+
+
+def iter_corpus(
+    size: int,
+    layout: str = "paragraphs",
+    vocab_size: int = 50_000,
+    zipf_s: float = 1.1,
+    seed: int = 0,
+):
+    """Yield the text of ``generate_corpus`` in blocks of a few hundred KB.
+
+    Only one block is held at a time, so a corpus larger than memory can
+    be written straight to a file (``fh.writelines(iter_corpus(...))``).
+    """
+    if layout not in BENCH_LAYOUTS:
+        raise ValueError(f"unknown layout {layout!r}; expected one of {BENCH_LAYOUTS}")
+    rng = random.Random(seed)
+    vocab = _bench_vocabulary(vocab_size, rng)
+    cum_weights = list(accumulate(1 / rank ** zipf_s for rank in range(1, vocab_size + 1)))
+    total = 0
+    sentences = 0
+    while total < size:
+        words = rng.choices(vocab, cum_weights=cum_weights, k=1 << 14)
+        parts: list[str] = []
+        pos = 0
+        while pos < len(words) and total < size:
+            sentence = words[pos:pos + rng.randint(5, 30)]
+            pos += len(sentence)
+            sentence[0] = sentence[0].capitalize()
+            if layout == "short-lines":
+                body = "\n".join(
+                    " ".join(sentence[i:i + 6]) for i in range(0, len(sentence), 6)
+                )
+                sep = "\n"
+            else:
+                body = " ".join(sentence)
+                sentences += 1
+                sep = "\n" if layout == "paragraphs" and sentences % 6 == 0 else " "
+            piece = body + rng.choice("....!?") + sep
+            if total + len(piece) > size:  # only the last piece is trimmed
+                piece = piece[:size - total]
+            parts.append(piece)
+            total += len(piece)
+        yield "".join(parts)
+
+
+def generate_corpus(
+    size: int,
+    layout: str = "paragraphs",
+    vocab_size: int = 50_000,
+    zipf_s: float = 1.1,
+    seed: int = 0,
+) -> str:
+    """Return *size* characters of reproducible English-like ASCII text.
+
+    Word frequencies follow a Zipf law with exponent *zipf_s* over
+    *vocab_size* words; sentences are 5-30 words long.  *layout* picks the
+    line structure: ``"paragraphs"`` (one ~6-sentence paragraph per line),
+    ``"long-lines"`` (no line breaks at all) or ``"short-lines"`` (a line
+    break every 6 words).  The same arguments always give the same text.
+    Use ``iter_corpus`` to stream corpora too large to build in memory.
+    """
+    return "".join(iter_corpus(size, layout, vocab_size, zipf_s, seed))
+
+
+def _bench_call(op: str, text: str, term: str) -> None:
+    analyzer = TextAnalyzer(text)
+    if op == "search":
+        analyzer.search(term)
+    elif op == "concordance":
+        analyzer.concordance(term)
+    else:
+        getattr(analyzer, op)()
+
+
+def benchmark(
+    sizes=(1 << 20,),
+    layouts=BENCH_LAYOUTS,
+    ops=BENCH_OPS,
+    memory: bool = True,
+    seed: int = 0,
+) -> dict:
+    """Measure throughput and peak memory of the main operations.
+
+    For every corpus size (characters) and layout, each op in *ops* runs
+    once on a fresh ``TextAnalyzer`` with an empty result cache, i.e. the
+    cold cost a caller pays.  ``search`` and ``concordance`` look up the
+    100th most frequent word.  With *memory* set each op runs a second
+    time under ``tracemalloc`` to record its peak allocation (kept out of
+    the timed run, which it would slow down).
+
+    Returns a JSON-serializable dict whose ``results`` are in a stable
+    order, so reports from two versions can be diffed.
+    """
+    results = []
+    for size in sizes:
+        for layout in layouts:
+            text = generate_corpus(size, layout, seed=seed)
+            term = _bench_vocabulary(50_000, random.Random(seed))[99]
+            for op in ops:
+                RESULT_CACHE.clear()
+                start = time.perf_counter()
+                _bench_call(op, text, term)
+                seconds = time.perf_counter() - start
+                record = {
+                    "op": op,
+                    "layout": layout,
+                    "size": len(text),
+                    "seconds": round(seconds, 4),
+                    "mb_per_s": round(len(text) / 1e6 / seconds, 2) if seconds else None,
+                    "peak_bytes": None,
+                }
+                if memory:
+                    RESULT_CACHE.clear()
+                    tracemalloc.start()
+                    try:
+                        _bench_call(op, text, term)
+                        record["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+                    finally:
+                        tracemalloc.stop()
+                results.append(record)
+    RESULT_CACHE.clear()
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
@@ -480,6 +4268,81 @@ if __name__ == "__main__":
     if "--test" in sys.argv:
         run_tests()
         print("All tests passed!")
+    elif "--bench" in sys.argv:
+        # Throughput / peak memory on generated corpora; JSON for diffing
+        def _option(name, default):
+            return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+        sizes_mb = [float(mb) for mb in _option("--sizes", "1,10").split(",")]
+        report = benchmark(
+            sizes=[int(mb * (1 << 20)) for mb in sizes_mb],
+            layouts=_option("--layouts", ",".join(BENCH_LAYOUTS)).split(","),
+            memory="--no-memory" not in sys.argv,
+        )
+        for r in report["results"]:
+            peak = f"{r['peak_bytes'] / 2**20:9.1f} MiB" if r["peak_bytes"] else ""
+            print(
+                f"{r['size'] / 2**20:7.1f} MiB {r['layout']:<12} {r['op']:<12}"
+                f"{r['seconds']:9.3f} s {r['mb_per_s'] or 0:9.2f} MB/s {peak}"
+            )
+        out = _option("--json", None)
+        if out:
+            with open(out, "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+                fh.write("\n")
+    elif "--stream" in sys.argv:
+        # Analyze files chunk by chunk without loading them into memory
+        for filepath in (a for a in sys.argv[1:] if not a.startswith("-")):
+            counts = scan_file(
+                filepath,
+                use_mmap="--mmap" in sys.argv,
+                approximate="--approx" in sys.argv,
+            )
+            print(f"== {filepath}")
+            print(counts.to_stats(DEFAULT_STOPWORDS))
+            print(counts.to_readability())
+    elif "--jobs" in sys.argv or sum(
+        not a.startswith("-") for a in sys.argv[1:]
+    ) > 1 or (len(sys.argv) > 1 and os.path.isdir(sys.argv[-1])):
+        # Analyze a corpus of files/directories across a process pool
+        args = sys.argv[1:]
+        jobs = None
+        if "--jobs" in args:
+            i = args.index("--jobs")
+            jobs = int(args[i + 1])
+            del args[i:i + 2]
+        inputs = [a for a in args if not a.startswith("-")]
+
+        def print_file(fa: FileAnalysis) -> None:
+            if fa.error:
+                print(f"{fa.path}: ERROR {fa.error}")
+            else:
+                print(
+                    f"{fa.path}: {fa.stats.word_count} words, "
+                    f"grade {fa.readability.flesch_kincaid_grade:.1f}"
+                )
+
+        n_files = 0
+        if "--pipeline" in args:
+            # Stream results as they complete; memory stays flat
+            def sink(fa: FileAnalysis) -> None:
+                global n_files
+                n_files += 1
+                print_file(fa)
+
+            result = IngestionPipeline(
+                jobs=jobs, approximate="--approx" in args
+            ).run(CorpusAnalyzer.iter_files(inputs), sink=sink)
+        else:
+            result = CorpusAnalyzer(
+                jobs=jobs, approximate="--approx" in args
+            ).analyze_paths(inputs)
+            n_files = len(result.files)
+            for fa in result.files:
+                print_file(fa)
+        print(f"\n== Corpus ({n_files} files)")
+        print(result.stats)
+        print(result.readability)
     elif len(sys.argv) > 1 and not sys.argv[1].startswith("-"):
         # Analyze a file passed as argument
         filepath = sys.argv[1]